@@ -1,49 +1,128 @@
-import sounddevice as sd
 import webrtcvad
 import numpy as np
 import queue
 import time
 
+from models.audio_summary import AudioSummaryAccumulator
+from audio.ring_buffer import PcmRingBuffer
+from audio.sources import MicrophoneSource
+
 class AudioRecorder:
-    def __init__(self, sample_rate=16000, frame_ms=30, silence_limit=0.9, vad_aggressiveness=2):
+    def __init__(self, sample_rate=16000, frame_ms=30, silence_limit=0.9, vad_aggressiveness=2,
+                 segment_pause=0.3, min_segment_s=1.0, max_segment_s=25.0,
+                 preroll_s=0.3, max_utterance_s=120.0, start_timeout_s=10.0, source=None):
+        # source: where frames come from (audio/sources.py); the microphone by default
+        self.source = source if source is not None else MicrophoneSource()
         self.sample_rate = sample_rate
         self.frame_ms = frame_ms
         self.frame_size = int(sample_rate * frame_ms / 1000)
         self.silence_limit = silence_limit
+        # Endpointing counts frames (the audio clock), not wall time, so a backlog in the
+        # queue cannot end a turn early. The turn starts at the first speech frame, with
+        # `preroll_s` of audio from before it so the onset is not clipped; it is cut at
+        # `max_utterance_s`, and ends after `start_timeout_s` if nobody speaks.
+        self.silence_frames = int(silence_limit * 1000 / frame_ms)
+        self.start_timeout_frames = max(1, int(start_timeout_s * 1000 / frame_ms))
+        self.ring = PcmRingBuffer(int(preroll_s * sample_rate), int(max_utterance_s * sample_rate))
         self.vad = webrtcvad.Vad(vad_aggressiveness)
         self.audio_queue = queue.Queue()
+        # Streaming segmentation (only used when record_until_silence gets on_segment):
+        # a pause of `segment_pause` s closes a segment once it is at least `min_segment_s` long;
+        # `max_segment_s` forces a cut so a segment always fits Whisper's 30 s window.
+        self.segment_pause_frames = max(1, int(segment_pause * 1000 / frame_ms))
+        self.min_segment_frames = int(min_segment_s * 1000 / frame_ms)
+        self.max_segment_frames = int(max_segment_s * 1000 / frame_ms)
+        # audio_summary of the last recording, built frame by frame while capturing; its
+        # buffers are sized here for the longest turn and the largest chunk (the pre-roll)
+        self.summary = AudioSummaryAccumulator(sr=sample_rate, max_samples=self.ring.capacity,
+                                               max_chunk=max(self.frame_size, self.ring.preroll))
+        self.last_summary = None
+        self.last_timing = None
+        self.last_speech_span = None
 
     def audio_callback(self, indata, frames, time_info, status):
         self.audio_queue.put(bytes(indata))
 
+    @property
+    def exhausted(self):
+        """True once a file/stream source has run out and all its audio has been recorded."""
+        return getattr(self.source, "finished", False) and self.audio_queue.empty()
+
     def is_speech(self, frame):
         return self.vad.is_speech(frame, self.sample_rate)
 
-    def record_until_silence(self):
-        frames = []
-        silence_start = None
+    def record_until_silence(self, on_segment=None):
+        """
+        Record one caller turn and return it as int16; its audio_summary is in last_summary.
+        The returned array (and every segment) is a read-only view of the recorder's
+        preallocated buffer, valid until the next-but-one call; copy it to keep it longer.
+        on_segment(segment, final): called during capture with each VAD-delimited segment
+        (int16, empty when it holds no speech); the last call has final=True.
+        last_timing: time.monotonic() stamps of the turn (onset, speech_end, endpoint).
+        last_speech_span: (start, end) samples of the returned audio from the first speech frame
+        to the end of the last one, by the VAD decisions taken here; (0, 0) without speech.
+        """
+        ring = self.ring
+        ring.reset()
+        idle = 0             # non-speech frames before the onset
+        silence = 0          # consecutive non-speech frames after it
+        seg_start = 0        # sample index (in the utterance) where the current segment starts
+        seg_speech = False   # current segment holds at least one speech frame
+        seg_max = self.max_segment_frames * self.frame_size
+        seg_min = self.min_segment_frames * self.frame_size
+        timing = {"onset": None, "speech_end": None, "endpoint": None}
+        span = [0, 0]
+        self.summary.reset()
         print("🎤 Speak now...")
 
-        with sd.RawInputStream(
-            samplerate=self.sample_rate,
-            blocksize=self.frame_size,
-            dtype="int16",
-            channels=1,
-            callback=self.audio_callback
-        ):
+        with self.source.open(self.sample_rate, self.frame_size, self.audio_callback):
             while True:
                 frame = self.audio_queue.get()
-                frames.append(frame)
+                pcm = np.frombuffer(frame, dtype=np.int16)
+                speech = self.is_speech(frame)
+
+                if not ring.started:
+                    if not speech:
+                        ring.push_idle(pcm)
+                        idle += 1
+                        if idle >= self.start_timeout_frames:
+                            self.summary.add(ring.begin())
+                            print("🛑 No speech")
+                            break
+                        continue
+                    self.summary.add(ring.begin())
+                    timing["onset"] = time.monotonic()
+                n = ring.push(pcm)
+                self.summary.add(pcm[:n])
 
-                if self.is_speech(frame):
-                    silence_start = None
+                if speech:
+                    silence = 0
+                    seg_speech = True
+                    timing["speech_end"] = time.monotonic()
+                    if span[1] == 0:
+                        span[0] = len(ring) - n
+                    span[1] = len(ring)
                 else:
-                    if silence_start is None:
-                        silence_start = time.time()
-                    elif time.time() - silence_start > self.silence_limit:
+                    silence += 1
+                    if silence > self.silence_frames:
                         print("🛑 Silence detected")
                         break
+                if ring.full:
+                    print("🛑 Max utterance length reached")
+                    break
+
+                if on_segment is not None and seg_speech:
+                    seg_len = len(ring) - seg_start
+                    if ((silence >= self.segment_pause_frames and seg_len >= seg_min)
+                            or seg_len >= seg_max):
+                        on_segment(ring.view(seg_start), False)
+                        seg_start, seg_speech = len(ring), False
+
+        timing["endpoint"] = time.monotonic()
+        self.last_timing = timing
+        self.last_speech_span = tuple(span)
+        self.last_summary = self.summary.summary()
+        if on_segment is not None:
+            on_segment(ring.view(seg_start if seg_speech else len(ring)), True)
 
-        audio_bytes = b"".join(frames)
-        audio_np = np.frombuffer(audio_bytes, dtype=np.int16)
-        return audio_np
+        return ring.view()
@@ -0,0 +1,78 @@
+# Preallocated int16 capture storage for AudioRecorder (no per-frame allocation).
+# Before speech onset, frames go round a small pre-roll ring; at onset the pre-roll is laid
+# down once at the front of a linear utterance buffer and the following frames are appended
+# after it, so the finished utterance is one contiguous slice handed out as a NumPy view.
+
+import numpy as np
+
+
+class PcmRingBuffer:
+    def __init__(self, preroll_samples: int, max_samples: int, n_buffers: int = 2):
+        """
+        preroll_samples: audio kept from before the onset; max_samples: utterance cap after it.
+        n_buffers: utterance buffers used in turn, so a returned view stays valid while the
+        next n_buffers - 1 utterances are recorded.
+        """
+        if max_samples <= 0:
+            raise ValueError("max_samples must be > 0.")
+        self.preroll = max(0, int(preroll_samples))
+        self.capacity = self.preroll + int(max_samples)
+        self._bufs = [np.zeros(self.capacity, dtype=np.int16) for _ in range(max(1, n_buffers))]
+        self._ring = np.zeros(max(1, self.preroll), dtype=np.int16)
+        self._which = -1
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new utterance in the next buffer."""
+        self._which = (self._which + 1) % len(self._bufs)
+        self.buf = self._bufs[self._which]
+        self._ring_pos = 0
+        self._ring_fill = 0
+        self.started = False
+        self.start = 0
+        self.end = 0
+
+    def push_idle(self, pcm: np.ndarray) -> None:
+        """Before onset: keep only the last `preroll` samples."""
+        if self.preroll == 0:
+            return
+        pcm = pcm[-self.preroll:]
+        n, size = len(pcm), len(self._ring)
+        first = min(n, size - self._ring_pos)
+        self._ring[self._ring_pos:self._ring_pos + first] = pcm[:first]
+        self._ring[:n - first] = pcm[first:]
+        self._ring_pos = (self._ring_pos + n) % size
+        self._ring_fill = min(size, self._ring_fill + n)
+
+    def begin(self) -> np.ndarray:
+        """Speech onset: move the pre-roll in front of the utterance; returns it as a view."""
+        fill = self._ring_fill
+        self.start = self.preroll - fill
+        oldest = (self._ring_pos - fill) % len(self._ring)
+        first = min(fill, len(self._ring) - oldest)
+        self.buf[self.start:self.start + first] = self._ring[oldest:oldest + first]
+        self.buf[self.start + first:self.preroll] = self._ring[:fill - first]
+        self.end = self.preroll
+        self.started = True
+        return self.view(0, fill)
+
+    def push(self, pcm: np.ndarray) -> int:
+        """After onset: append; returns how many samples fit (fewer once max_samples is reached)."""
+        n = min(len(pcm), self.capacity - self.end)
+        self.buf[self.end:self.end + n] = pcm[:n]
+        self.end += n
+        return n
+
+    @property
+    def full(self) -> bool:
+        return self.end >= self.capacity
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def view(self, a: int = 0, b: int = None) -> np.ndarray:
+        """Read-only view of utterance samples [a, b) (relative to the utterance start)."""
+        b = len(self) if b is None else b
+        v = self.buf[self.start + a:self.start + b]
+        v.flags.writeable = False
+        return v
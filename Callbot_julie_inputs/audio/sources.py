@@ -0,0 +1,176 @@
+# Audio sources for AudioRecorder. A source feeds fixed-size 16-bit mono frames to the
+# recorder's callback, like sounddevice.RawInputStream, so the same VAD/endpointing runs
+# on a microphone, a WAV file, raw PCM on stdin or a local UDP/TCP socket:
+#
+#   source = WavFileSource("call.wav", realtime=True)
+#   with source.open(sample_rate, frame_size, callback):
+#       ...                         # callback(frame_bytes, frames, time_info, status)
+#
+# Non-microphone sources read in a background thread that pauses between turns (outside
+# `with`), so no audio is lost from one record_until_silence call to the next. Once the
+# input is exhausted they set `finished` and keep feeding silence at real-time pace, so
+# the last turn still ends on silence.
+
+import sys
+import socket
+import threading
+import time
+import wave
+
+import numpy as np
+
+
+class MicrophoneSource:
+    """Live capture with sounddevice (the default source)."""
+
+    def open(self, sample_rate, frame_size, callback):
+        import sounddevice as sd  # only needed for live capture
+        return sd.RawInputStream(
+            samplerate=sample_rate,
+            blocksize=frame_size,
+            dtype="int16",
+            channels=1,
+            callback=callback
+        )
+
+
+class _ThreadedSource:
+    def __init__(self, realtime=False):
+        # realtime=True paces frames at the audio clock; otherwise they go as fast as read.
+        self.realtime = realtime
+        self.finished = False
+        self._active = threading.Event()
+        self._thread = None
+
+    def read(self, nbytes):
+        """Up to nbytes of PCM; b"" once the input is exhausted."""
+        raise NotImplementedError
+
+    def open(self, sample_rate, frame_size, callback):
+        self.sample_rate, self.frame_size, self.callback = sample_rate, frame_size, callback
+        return self
+
+    def __enter__(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name=type(self).__name__)
+            self._thread.start()
+        self._active.set()
+        return self
+
+    def __exit__(self, *exc):
+        self._active.clear()
+
+    def _run(self):
+        nbytes = 2 * self.frame_size
+        frame_s = self.frame_size / self.sample_rate
+        silence = bytes(nbytes)
+        due = None
+        while True:
+            if not self._active.is_set():
+                self._active.wait()
+                due = None  # paused between turns: restart the clock
+            frame = b"" if self.finished else self._read_frame(nbytes)
+            if len(frame) < nbytes:
+                self.finished = True
+                frame = frame + silence[len(frame):]
+            if self.realtime or self.finished:
+                due = time.monotonic() if due is None else due + frame_s
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.callback(frame, self.frame_size, None, None)
+
+    def _read_frame(self, nbytes):
+        chunks, got = [], 0
+        while got < nbytes:
+            chunk = self.read(nbytes - got)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            got += len(chunk)
+        return b"".join(chunks)
+
+
+class ArraySource(_ThreadedSource):
+    """int16 samples already in memory (already at the recorder's sample rate)."""
+
+    def __init__(self, audio, realtime=False):
+        super().__init__(realtime)
+        audio = np.asarray(audio)
+        if audio.dtype != np.int16 or audio.ndim != 1:
+            raise ValueError("ArraySource expects mono int16 samples.")
+        self._data = audio.tobytes()
+        self._pos = 0
+
+    def read(self, nbytes):
+        chunk = self._data[self._pos:self._pos + nbytes]
+        self._pos += len(chunk)
+        return chunk
+
+
+class WavFileSource(ArraySource):
+    """16-bit PCM WAV file; stereo is downmixed, the rate must match the recorder's."""
+
+    def __init__(self, path, realtime=False, sample_rate=16000):
+        with wave.open(path, "rb") as f:
+            if f.getsampwidth() != 2:
+                raise ValueError(f"{path}: expected 16-bit PCM, got {8 * f.getsampwidth()}-bit.")
+            if f.getframerate() != sample_rate:
+                raise ValueError(f"{path}: sample rate {f.getframerate()} Hz, expected {sample_rate} Hz.")
+            channels = f.getnchannels()
+            audio = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        if channels > 1:
+            audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        super().__init__(audio, realtime)
+
+
+class PcmStreamSource(_ThreadedSource):
+    """Raw little-endian 16-bit mono PCM from a binary stream (stdin by default), e.g.
+    `ffmpeg -i call.mp3 -f s16le -ac 1 -ar 16000 - | python ...`."""
+
+    def __init__(self, stream=None, realtime=False):
+        super().__init__(realtime)
+        self.stream = stream if stream is not None else sys.stdin.buffer
+
+    def read(self, nbytes):
+        return self.stream.read(nbytes)
+
+
+class SocketSource(_ThreadedSource):
+    """Raw 16-bit mono PCM sent to a local socket.
+    proto="udp": datagrams of any size are reassembled into frames; an empty one ends the input.
+    Between turns nothing is read, so UDP audio beyond the socket buffer is dropped there.
+    proto="tcp": accepts one connection and reads it until the peer closes it."""
+
+    def __init__(self, port, host="127.0.0.1", proto="udp", realtime=False):
+        if proto not in ("udp", "tcp"):
+            raise ValueError(f"proto must be 'udp' or 'tcp', got {proto!r}.")
+        super().__init__(realtime)
+        self.proto = proto
+        kind = socket.SOCK_DGRAM if proto == "udp" else socket.SOCK_STREAM
+        self.sock = socket.socket(socket.AF_INET, kind)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        if proto == "tcp":
+            self.sock.listen(1)
+        self._conn = None
+        self._pending = b""
+
+    def read(self, nbytes):
+        if not self._pending:
+            if self.proto == "udp":
+                self._pending = self.sock.recv(65536)
+            else:
+                if self._conn is None:
+                    self._conn, _ = self.sock.accept()
+                self._pending = self._conn.recv(65536)
+                if not self._pending:
+                    return b""
+        chunk, self._pending = self._pending[:nbytes], self._pending[nbytes:]
+        return chunk
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+        self.sock.close()
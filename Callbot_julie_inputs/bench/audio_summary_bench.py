@@ -0,0 +1,170 @@
+# Micro-benchmark: compute_audio_summary cost vs utterance length (1 s to 10 min).
+# Compares a frozen copy of the original compute_audio_summary (per-hop Python loop) with
+# the current one, checks that both return the same summary, and times
+# compute_audio_summary_batch. The synthetic calls never reach -32768; a last check shows
+# the one intended difference, full-scale negative samples now counting as clipped.
+# stream_*: AudioSummaryAccumulator fed 30 ms frames (per-frame cost, and summary() at end of turn).
+#
+#   python -m bench.audio_summary_bench [--lengths 1,10,60,300,600] [--repeat 5] [--batch 32]
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from models.audio_summary import AudioSummaryAccumulator, compute_audio_summary, compute_audio_summary_batch
+
+SR = 16000
+
+
+def legacy_summary(audio_np: np.ndarray, sr: int = SR, zones: int = 4,
+                   frame_ms: int = 25, hop_ms: int = 10,
+                   spike_z: float = 2.5, silence_rms: float = 0.01) -> dict:
+    # Frozen copy of the original compute_audio_summary (per-hop Python loop), so
+    # "identical" checks the whole summary, not only the RMS envelope.
+    if audio_np is None or audio_np.size == 0:
+        return {
+            "sample_rate_hz": sr,
+            "duration_ms": 0,
+            "num_zones": zones,
+            "global_peak_zone": 0,
+            "global_peak_zscore": 0.0,
+            "peak_zscore_by_zone": [0.0] * zones,
+            "spike_count_by_zone": [0] * zones,
+            "silence_ratio": 1.0,
+            "clipping_ratio": 0.0,
+        }
+
+    # normalize waveform [-1,1]
+    x = audio_np.astype(np.float32) / 32768.0
+    duration_ms = int(round(1000.0 * len(x) / sr))
+
+    # clipping ratio (saturation)
+    clipping_ratio = float(np.mean(np.abs(audio_np) >= 32760))
+
+    # RMS envelope
+    frame = max(1, int(sr * frame_ms / 1000))
+    hop = max(1, int(sr * hop_ms / 1000))
+
+    if len(x) < frame:
+        rms = np.array([float(np.sqrt(np.mean(x * x) + 1e-12))], dtype=np.float32)
+    else:
+        n_frames = 1 + (len(x) - frame) // hop
+        rms = np.empty(n_frames, dtype=np.float32)
+        for i in range(n_frames):
+            w = x[i * hop : i * hop + frame]
+            rms[i] = float(np.sqrt(np.mean(w * w) + 1e-12))
+
+    silence_ratio = float(np.mean(rms < silence_rms))
+
+    # z-score energy (spikes)
+    mu = float(rms.mean())
+    sd = float(rms.std() + 1e-8)
+    z = (rms - mu) / sd
+
+    # per-zone
+    n = len(z)
+    peak_zscore_by_zone = []
+    spike_count_by_zone = []
+
+    for zi in range(zones):
+        a = int(zi * n / zones)
+        b = int((zi + 1) * n / zones)
+        seg = z[a:b] if b > a else z[a:a+1]
+
+        peak_zscore_by_zone.append(round(float(seg.max()), 2))
+        spike_count_by_zone.append(int(np.sum(seg > spike_z)))
+
+    # global peak
+    peak_idx = int(np.argmax(z))
+    global_peak_zone = min(zones - 1, int(peak_idx * zones / max(1, n)))
+    global_peak_zscore = round(float(z[peak_idx]), 2)
+
+    return {
+        "sample_rate_hz": sr,
+        "duration_ms": duration_ms,
+        "num_zones": zones,
+        "global_peak_zone": global_peak_zone,
+        "global_peak_zscore": global_peak_zscore,
+        "peak_zscore_by_zone": peak_zscore_by_zone,
+        "spike_count_by_zone": spike_count_by_zone,
+        "silence_ratio": round(silence_ratio, 3),
+        "clipping_ratio": round(clipping_ratio, 3),
+    }
+
+
+def _differences(a: dict, b: dict) -> list:
+    return sorted(k for k in a if a[k] != b.get(k))
+
+
+def synthetic_call(seconds: float, seed: int = 0) -> np.ndarray:
+    """Speech-like bursts over low noise, a few loud spikes and some clipping."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SR)
+    t = np.arange(n) / SR
+    envelope = (np.sin(2 * np.pi * 0.7 * t) > 0.2) * (0.3 + 0.2 * np.sin(2 * np.pi * 3 * t))
+    x = envelope * np.sin(2 * np.pi * 180 * t) + 0.005 * rng.standard_normal(n)
+    for s in rng.integers(0, max(1, n - SR // 10), size=max(1, int(seconds // 5))):
+        x[s:s + SR // 10] *= 4.0
+    return (np.clip(x, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return 1000.0 * best
+
+
+def stream_cost(audio: np.ndarray, frame_ms: int = 30):
+    """(mean us per add(), ms for summary(), matches batch) for 30 ms frames."""
+    step = SR * frame_ms // 1000
+    acc = AudioSummaryAccumulator(sr=SR)
+    t0 = time.perf_counter()
+    for i in range(0, len(audio), step):
+        acc.add(audio[i:i + step])
+    frame_us = 1e6 * (time.perf_counter() - t0) / max(1, -(-len(audio) // step))
+    t0 = time.perf_counter()
+    summary = acc.summary()
+    final_ms = 1000.0 * (time.perf_counter() - t0)
+    return frame_us, final_ms, summary == compute_audio_summary(audio, sr=SR)
+
+
+def run(lengths, repeat: int, batch: int) -> None:
+    print(f"{'length_s':>8} {'legacy_ms':>10} {'vector_ms':>10} {'speedup':>8} {'identical':>9} "
+          f"{'stream_frame_us':>15} {'stream_final_ms':>15}")
+    for seconds in lengths:
+        audio = synthetic_call(seconds, seed=int(seconds))
+        same = not _differences(legacy_summary(audio), compute_audio_summary(audio, sr=SR))
+        legacy_ms = _time(lambda: legacy_summary(audio), max(1, repeat // 2) if seconds >= 60 else repeat)
+        vector_ms = _time(lambda: compute_audio_summary(audio, sr=SR), repeat)
+        frame_us, final_ms, stream_same = stream_cost(audio)
+        print(f"{seconds:>8g} {legacy_ms:>10.2f} {vector_ms:>10.2f} {legacy_ms / vector_ms:>7.1f}x "
+              f"{str(same and stream_same):>9} {frame_us:>15.1f} {final_ms:>15.3f}")
+
+    full_scale = synthetic_call(1.0)
+    full_scale[::50] = -32768
+    diff = _differences(legacy_summary(full_scale), compute_audio_summary(full_scale, sr=SR))
+    print(f"\nwith -32768 samples, fields that differ from the original: {diff or 'none'}")
+
+    calls = [synthetic_call(5 + (i % 10) * 3, seed=i) for i in range(batch)]
+    one_by_one = _time(lambda: [compute_audio_summary(a, sr=SR) for a in calls], repeat)
+    batched = _time(lambda: compute_audio_summary_batch(calls, sr=SR), repeat)
+    print(f"\nbatch of {batch} calls (5-32 s, {os.cpu_count()} CPUs): sequential {one_by_one:.1f} ms, "
+          f"compute_audio_summary_batch {batched:.1f} ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="compute_audio_summary legacy vs vectorized.")
+    ap.add_argument("--lengths", default="1,10,60,300,600", help="utterance lengths in seconds")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--batch", type=int, default=32)
+    args = ap.parse_args()
+    run([float(s) for s in args.lengths.split(",")], args.repeat, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# fp32 vs int8 vs ONNX Runtime backends of the inputs models (models/backends.py) on CPU.
+# Each backend runs in a fresh process so its memory is measured on its own. Reports:
+#   load_s, rss_mb      load time and resident memory after loading the three models
+#   asr_rtf, emo_rtf    processing time / audio duration (Whisper, wav2vec)
+#   bert_ms             mean ms per text (BERT)
+#   wer_vs_fp32         Whisper transcripts vs the fp32 ones
+#   wer_ref             vs the .txt reference transcripts, when the fixtures have them
+#   emo_agree, bert_agree   label agreement with fp32
+#
+#   python -m bench.backends_bench [--wavs DIR] [--backends torch,int8,onnx]
+#                                  [--bert-model cmarkea/distilcamembert-base-sentiment]
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bench.fixtures import SR, load_fixtures, synthetic_fixtures
+from bench.wer import wer
+
+TEXTS = [
+    "bonjour je veux déclarer un sinistre",
+    "je suis très mécontent, mon dossier a été refusé",
+    "merci beaucoup pour votre aide",
+    "où en est mon remboursement",
+    "c'est inadmissible, ça fait trois mois que j'attends",
+    "parfait, tout est clair",
+    "",
+    "oui",
+]
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource  # peak RSS (KB on Linux), fallback where /proc is missing
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _run_backend(backend, fixtures, bert_model, onnx_cache_dir):
+    # Runs in a child process.
+    from models.whisper import Whisper
+    from models.wav2vec_sentiment import Wav2VecSentiment
+    from models.bert_sentiment import BertSentiment
+
+    rss0, t0 = _rss_mb(), time.perf_counter()
+    whisper = Whisper(backend=backend, onnx_cache_dir=onnx_cache_dir)
+    wav2vec = Wav2VecSentiment(backend=backend, onnx_cache_dir=onnx_cache_dir)
+    bert = BertSentiment(model_id=bert_model, backend=backend, onnx_cache_dir=onnx_cache_dir)
+    load_s, rss_mb = time.perf_counter() - t0, _rss_mb() - rss0
+
+    # one untimed pass so lazy init is not billed to the first fixture
+    whisper.transcribe(fixtures[0][1])
+    wav2vec.analyze(fixtures[0][1])
+    bert.analyze(TEXTS[0])
+
+    audio_s = sum(len(a) for _, a, _ in fixtures) / SR
+    t0 = time.perf_counter()
+    texts = [whisper.transcribe(a) for _, a, _ in fixtures]
+    asr_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    emotions = [wav2vec.analyze(a)["audio_sentiment"] for _, a, _ in fixtures]
+    emo_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    labels = [bert.analyze(t)["label"] for t in TEXTS]
+    bert_s = time.perf_counter() - t0
+
+    return {"load_s": load_s, "rss_mb": max(0.0, rss_mb), "asr_rtf": asr_s / audio_s,
+            "emo_rtf": emo_s / audio_s, "bert_ms": 1000.0 * bert_s / len(TEXTS),
+            "texts": texts, "emotions": emotions, "labels": labels}
+
+
+def _agreement(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a) if a else 0.0
+
+
+def run(fixtures, backends, bert_model, onnx_cache_dir=None):
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            results[backend] = ex.submit(_run_backend, backend, fixtures, bert_model, onnx_cache_dir).result()
+
+    base = results.get("torch")
+    refs = [ref for _, _, ref in fixtures]
+    has_refs = all(ref is not None for ref in refs)
+    print(f"{'backend':<8} {'load_s':>7} {'rss_mb':>8} {'asr_rtf':>8} {'emo_rtf':>8} {'bert_ms':>8} "
+          f"{'wer_vs_fp32':>11} {'wer_ref':>8} {'emo_agree':>9} {'bert_agree':>10}")
+    for backend, r in results.items():
+        vs = (f"{wer(base['texts'], r['texts']):>11.3f}" if base else f"{'-':>11}")
+        ref = f"{wer(refs, r['texts']):>8.3f}" if has_refs else f"{'-':>8}"
+        emo = f"{_agreement(base['emotions'], r['emotions']):>9.1%}" if base else f"{'-':>9}"
+        lab = f"{_agreement(base['labels'], r['labels']):>10.1%}" if base else f"{'-':>10}"
+        print(f"{backend:<8} {r['load_s']:>7.1f} {r['rss_mb']:>8.0f} {r['asr_rtf']:>8.3f} {r['emo_rtf']:>8.3f} "
+              f"{r['bert_ms']:>8.1f} {vs} {ref} {emo} {lab}")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare CPU inference backends of the inputs models.")
+    ap.add_argument("--wavs", help="directory of 16-bit WAV fixtures (+ optional .txt transcripts)")
+    ap.add_argument("--backends", default="torch,int8,onnx")
+    ap.add_argument("--bert-model", default="cmarkea/distilcamembert-base-sentiment",
+                    help="PyTorch sentiment checkpoint (int8/onnx cannot use the TF default)")
+    ap.add_argument("--onnx-cache-dir", default=None)
+    args = ap.parse_args()
+    fixtures = load_fixtures(args.wavs) if args.wavs else synthetic_fixtures()
+    run(fixtures, [b.strip() for b in args.backends.split(",")], args.bert_model, args.onnx_cache_dir)
+
+
+if __name__ == "__main__":
+    main()
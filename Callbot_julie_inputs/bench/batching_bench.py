@@ -0,0 +1,158 @@
+# Throughput vs latency of cross-call micro-batching (pipeline/batching.py).
+# N simulated concurrent calls each submit utterances of synthetic audio; compares
+# direct batch-size-1 calls with MicroBatcher at several wait windows.
+#
+#   python -m bench.batching_bench [--calls 16] [--per-call 4] [--waits 0,5,10,25] [--max-batch 8]
+#   python -m bench.batching_bench --real      # real Whisper/wav2vec from the model registry
+#
+# Without --real, toy NumPy models stand in for Whisper and wav2vec with the same cost
+# shape: an encoder over padded 20 ms frames plus (for the ASR model) a fixed number of
+# decoder steps whose cost barely grows with the batch size.
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from pipeline.batching import BatchedWav2Vec, BatchedWhisper
+
+SR = 16000
+FRAME = SR // 50
+
+
+class ToyWhisper:
+    def __init__(self, dim=768, steps=48, seed=0):
+        rng = np.random.default_rng(seed)
+        self.enc = rng.standard_normal((FRAME, dim)).astype(np.float32) / np.sqrt(FRAME)
+        self.dec = rng.standard_normal((dim, dim)).astype(np.float32) / np.sqrt(dim)
+        self.steps = steps
+
+    def transcribe_batch(self, audios, sr=SR):
+        # Whisper pads every input to its 30 s window: the encoder cost is per item.
+        x = np.zeros((len(audios), 30 * 50, FRAME), dtype=np.float32)
+        for i, a in enumerate(audios):
+            a = np.asarray(a[:30 * SR], dtype=np.float32) / 32768.0
+            n = len(a) // FRAME
+            x[i, :n] = a[:n * FRAME].reshape(n, FRAME)
+        h = np.tanh(x @ self.enc).mean(axis=1)
+        for _ in range(self.steps):  # autoregressive steps: one small matmul for the whole batch
+            h = np.tanh(h @ self.dec)
+        return [f"tok{int(abs(v) * 1000) % 97}" for v in h[:, 0]]
+
+    def transcribe(self, audio, sr=SR):
+        return self.transcribe_batch([audio], sr)[0]
+
+
+class ToyWav2Vec:
+    def __init__(self, dim=256, layers=4, seed=1):
+        rng = np.random.default_rng(seed)
+        self.enc = rng.standard_normal((FRAME, dim)).astype(np.float32) / np.sqrt(FRAME)
+        self.layers = [rng.standard_normal((dim, dim)).astype(np.float32) / np.sqrt(dim) for _ in range(layers)]
+
+    def analyze_batch(self, audios, sr=SR):
+        # Padded to the longest utterance in the batch, as Wav2Vec2Processor(padding=True).
+        n = max(len(a) for a in audios) // FRAME or 1
+        x = np.zeros((len(audios), n, FRAME), dtype=np.float32)
+        for i, a in enumerate(audios):
+            m = len(a) // FRAME
+            x[i, :m] = (np.asarray(a[:m * FRAME], dtype=np.float32) / 32768.0).reshape(m, FRAME)
+        h = np.tanh(x @ self.enc)
+        for w in self.layers:
+            h = np.tanh(h @ w)
+        pooled = h.mean(axis=1)
+        return [{"audio_sentiment": int(np.argmax(p[:7]))} for p in pooled]
+
+    def analyze(self, audio, sr=SR):
+        return self.analyze_batch([audio], sr)[0]
+
+
+def synthetic_utterances(n, seed=0, min_s=1.0, max_s=8.0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        length = int(rng.uniform(min_s, max_s) * SR)
+        out.append((rng.standard_normal(length) * 3000).astype(np.int16))
+    return out
+
+
+def drive(whisper, wav2vec, calls, per_call, seed=0):
+    """Run `calls` concurrent callers, each doing `per_call` turns (ASR and emotion in parallel)."""
+    utterances = synthetic_utterances(calls * per_call, seed)
+    latencies = []
+    lock = threading.Lock()
+
+    def caller(c):
+        for k in range(per_call):
+            audio = utterances[c * per_call + k]
+            t0 = time.perf_counter()
+            emo = threading.Thread(target=wav2vec.analyze, args=(audio,))
+            emo.start()
+            whisper.transcribe(audio)
+            emo.join()
+            with lock:
+                latencies.append(1000.0 * (time.perf_counter() - t0))
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=caller, args=(c,)) for c in range(calls)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    lat = np.sort(np.array(latencies))
+    return {"turns/s": len(lat) / wall, "p50_ms": float(np.percentile(lat, 50)),
+            "p95_ms": float(np.percentile(lat, 95))}
+
+
+class _Serialized:
+    """Batch-size-1 baseline: one model call at a time, as a single shared model instance does."""
+
+    def __init__(self, model, method):
+        self._fn = getattr(model, method)
+        self._lock = threading.Lock()
+        setattr(self, method, self._call)
+
+    def _call(self, audio, sr=SR):
+        with self._lock:
+            return self._fn(audio, sr=sr)
+
+
+def run(calls, per_call, waits, max_batch, real=False):
+    if real:
+        from models.registry import MODELS
+        whisper, wav2vec = MODELS.get("whisper"), MODELS.get("wav2vec")
+    else:
+        whisper, wav2vec = ToyWhisper(), ToyWav2Vec()
+
+    print(f"{'config':<22} {'turns/s':>8} {'p50_ms':>9} {'p95_ms':>9} {'mean_batch':>10}")
+    r = drive(_Serialized(whisper, "transcribe"), _Serialized(wav2vec, "analyze"), calls, per_call)
+    print(f"{'batch=1 (direct)':<22} {r['turns/s']:>8.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {1.0:>10.2f}")
+
+    for wait in waits:
+        bw = BatchedWhisper(whisper, max_batch=max_batch, max_wait_ms=wait)
+        bv = BatchedWav2Vec(wav2vec, max_batch=max_batch, max_wait_ms=wait)
+        try:
+            r = drive(bw, bv, calls, per_call)
+        finally:
+            bw.close()
+            bv.close()
+        s = bw.batcher.stats
+        mean_batch = s["items"] / max(1, s["batches"])
+        label = f"batch<={max_batch} wait={wait:g}ms"
+        print(f"{label:<22} {r['turns/s']:>8.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {mean_batch:>10.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Micro-batching throughput vs latency.")
+    ap.add_argument("--calls", type=int, default=16, help="concurrent simulated calls")
+    ap.add_argument("--per-call", type=int, default=4, help="turns per call")
+    ap.add_argument("--waits", default="0,5,10,25", help="max_wait_ms values to try")
+    ap.add_argument("--max-batch", type=int, default=8)
+    ap.add_argument("--real", action="store_true", help="use the real models (slow, needs weights)")
+    args = ap.parse_args()
+    run(args.calls, args.per_call, [float(w) for w in args.waits.split(",")], args.max_batch, args.real)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Text sentiment throughput: the old per-call path (one HF pipeline call per transcript)
+# vs BertSentiment.analyze_batch, cold (empty cache) and warm (repeated phrases cached).
+# The corpus mimics call transcripts: a few phrases that come back often, long ones,
+# and empty / one-word turns. Use a PyTorch checkpoint: transformers only batches list
+# inputs for PyTorch pipelines, a TensorFlow one (tblard/tf-allocine) runs text by text.
+#
+#   python -m bench.bert_bench [--texts 400] [--batch-size 16] [--model cmarkea/distilcamembert-base-sentiment]
+
+import argparse
+import time
+
+import numpy as np
+
+from models.bert_sentiment import BertSentiment, normalize_text
+
+PHRASES = [
+    "bonjour je veux déclarer un sinistre",
+    "je suis très mécontent, mon dossier a été refusé",
+    "merci beaucoup pour votre aide",
+    "où en est mon remboursement",
+    "c'est inadmissible, ça fait trois mois que j'attends",
+    "parfait, tout est clair",
+    "oui",
+    "non",
+    "euh",
+    "",
+    "d'accord merci",
+    "je voudrais parler à un conseiller s'il vous plaît",
+]
+LONG = ("j'ai eu un accident avec ma voiture la semaine dernière sur l'autoroute, "
+        "l'autre conducteur est parti sans remplir le constat et depuis personne ne me rappelle, ") * 6
+
+
+def corpus(n, seed=0):
+    """Zipf-like repeats of PHRASES, plus unique and long transcripts."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(PHRASES) + 1)
+    out = []
+    for i in range(n):
+        r = rng.random()
+        if r < 0.6:
+            out.append(PHRASES[rng.choice(len(PHRASES), p=weights / weights.sum())])
+        elif r < 0.9:
+            out.append(f"mon contrat numéro {i} ne couvre pas le dégât des eaux du {i % 28 + 1} du mois")
+        else:
+            out.append(LONG[: int(rng.integers(200, len(LONG)))])
+    return out
+
+
+def _time(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def run(n, batch_size, model_id):
+    bert = BertSentiment(model_id=model_id, batch_size=batch_size)
+    texts = corpus(n)
+    bert.pipe(PHRASES[0])  # warm-up, not timed
+
+    # per-call baseline: what analyze() used to do (short texts only: the old path did not
+    # truncate, so transcripts over the model's limit would fail)
+    per_call_texts = [t for t in texts if len(t) < 400]
+    per_call_s, per_call = _time(lambda: [bert.pipe(t)[0] for t in per_call_texts])
+    cold_s, cold = _time(lambda: bert.analyze_batch(texts))
+    warm_s, _ = _time(lambda: bert.analyze_batch(texts))
+
+    batched = {t: r for t, r in zip(texts, cold)}
+    agree = [p["label"] == batched[t]["label"] for t, p in zip(per_call_texts, per_call)
+             if len(normalize_text(t)) >= bert.min_chars]
+    print(f"{len(texts)} texts, {len(set(texts))} distinct, batch_size={batch_size}, "
+          f"framework={bert.pipe.framework}")
+    print(f"{'path':<22} {'texts/s':>9} {'ms/text':>8}")
+    for label, secs, count in (("per-call (old)", per_call_s, len(per_call_texts)),
+                               ("analyze_batch cold", cold_s, len(texts)),
+                               ("analyze_batch warm", warm_s, len(texts))):
+        print(f"{label:<22} {count / secs:>9.1f} {1000.0 * secs / count:>8.2f}")
+    print(f"label agreement with per-call: {np.mean(agree):.1%}; stats: {bert.stats}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="BERT sentiment: per-call vs batched + cached.")
+    ap.add_argument("--texts", type=int, default=400)
+    ap.add_argument("--batch-size", type=int, default=16)
+    ap.add_argument("--model", default="cmarkea/distilcamembert-base-sentiment")
+    args = ap.parse_args()
+    run(args.texts, args.batch_size, args.model)
+
+
+if __name__ == "__main__":
+    main()
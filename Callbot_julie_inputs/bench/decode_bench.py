@@ -0,0 +1,54 @@
+# Whisper decoding profiles (models/whisper.py::PROFILES) on local French fixtures:
+# "default" (language detection, model's generation config) vs "fr_fast" (forced French,
+# capped new tokens) with greedy decoding and each extra beam count given.
+# Reports per-fixture latency, time saved vs default, WER vs the .txt references (when
+# every fixture has one) and WER vs the default profile's transcripts.
+#
+#   python -m bench.decode_bench --wavs DIR [--beams 1,4] [--model openai/whisper-small]
+
+import argparse
+import time
+
+from bench.fixtures import SR, load_fixtures, synthetic_fixtures
+from bench.wer import wer
+
+
+def _transcribe_all(whisper, fixtures):
+    texts, t0 = [], time.perf_counter()
+    for _, audio, _ in fixtures:
+        texts.append(whisper.transcribe(audio, SR))
+    return texts, 1000.0 * (time.perf_counter() - t0) / len(fixtures)
+
+
+def run(fixtures, beams, model_id):
+    from models.whisper import Whisper
+    whisper = Whisper(model_id=model_id)
+    whisper.transcribe(fixtures[0][1], SR)  # warm-up, not timed
+
+    configs = [("default", None)] + [("fr_fast", b) for b in beams]
+    refs = [ref for _, _, ref in fixtures]
+    has_refs = all(ref is not None for ref in refs)
+    base_texts, base_ms = None, None
+    print(f"{'profile':<16} {'ms/fixture':>10} {'saved':>7} {'wer_ref':>8} {'wer_vs_default':>14}")
+    for profile, num_beams in configs:
+        whisper.set_profile(profile, num_beams)
+        texts, ms = _transcribe_all(whisper, fixtures)
+        if base_texts is None:
+            base_texts, base_ms = texts, ms
+        label = profile if num_beams is None else f"{profile} beams={num_beams}"
+        ref = f"{wer(refs, texts):>8.3f}" if has_refs else f"{'-':>8}"
+        print(f"{label:<16} {ms:>10.0f} {1 - ms / base_ms:>7.1%} {ref} {wer(base_texts, texts):>14.3f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Whisper decoding profiles: latency and WER.")
+    ap.add_argument("--wavs", help="directory of French 16-bit WAV fixtures + .txt transcripts")
+    ap.add_argument("--beams", default="1,4", help="beam counts to try with fr_fast")
+    ap.add_argument("--model", default="openai/whisper-small")
+    args = ap.parse_args()
+    fixtures = load_fixtures(args.wavs) if args.wavs else synthetic_fixtures()
+    run(fixtures, [int(b) for b in args.beams.split(",")], args.model)
+
+
+if __name__ == "__main__":
+    main()
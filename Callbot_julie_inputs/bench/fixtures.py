@@ -0,0 +1,60 @@
+# Audio fixtures for the inputs benchmarks.
+# A fixture directory holds 16-bit PCM WAV files, each optionally with a same-name .txt
+# reference transcript (French). Without a directory, synthetic audio is used (no transcripts).
+
+import os
+import wave
+from math import gcd
+
+import numpy as np
+
+SR = 16000
+
+
+def load_wav(path, sr=SR):
+    """int16 mono samples of a 16-bit PCM WAV, resampled to `sr` if needed."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {8 * f.getsampwidth()}-bit.")
+        rate, channels = f.getframerate(), f.getnchannels()
+        audio = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != sr:
+        from scipy.signal import resample_poly
+        g = gcd(rate, sr)
+        audio = np.clip(resample_poly(audio.astype(np.float32), sr // g, rate // g), -32768, 32767).astype(np.int16)
+    return audio
+
+
+def load_fixtures(directory, sr=SR):
+    """[(name, int16 audio, reference transcript or None)] sorted by file name."""
+    out = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".wav"):
+            continue
+        path = os.path.join(directory, name)
+        ref_path = os.path.splitext(path)[0] + ".txt"
+        ref = None
+        if os.path.isfile(ref_path):
+            with open(ref_path, encoding="utf-8") as f:
+                ref = f.read().strip()
+        out.append((name, load_wav(path, sr), ref))
+    if not out:
+        raise ValueError(f"no .wav files in {directory}.")
+    return out
+
+
+def synthetic_fixtures(n=6, seed=0, min_s=1.0, max_s=8.0, sr=SR):
+    """Speech-like bursts (harmonics under a syllable-rate envelope) over low noise."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n):
+        length = int(rng.uniform(min_s, max_s) * sr)
+        t = np.arange(length) / sr
+        f0 = rng.uniform(100, 220)
+        voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = np.clip(np.sin(2 * np.pi * rng.uniform(2, 5) * t), 0, None)
+        x = 0.2 * envelope * voice + 0.003 * rng.standard_normal(length)
+        out.append((f"synthetic_{i}", (np.clip(x, -1, 1) * 32767).astype(np.int16), None))
+    return out
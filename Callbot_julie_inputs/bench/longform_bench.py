@@ -0,0 +1,63 @@
+# Long-form Whisper: the old single call (truncated to the 30 s window) vs chunked
+# transcription (models/whisper.py: VAD split, batched chunks, stitched text).
+# Fixtures are concatenated, with 0.5 s pauses, into calls of the requested lengths.
+# Reports latency, words returned and, when every fixture has a .txt reference, WER.
+#
+#   python -m bench.longform_bench [--wavs DIR] [--seconds 20,40,80,160] [--batch-chunks 8]
+
+import argparse
+import time
+
+import numpy as np
+
+from bench.fixtures import SR, load_fixtures, synthetic_fixtures
+from bench.wer import wer
+
+
+def long_audio(fixtures, seconds):
+    """Fixtures repeated in order up to `seconds`; returns (int16 audio, reference or None)."""
+    pause = np.zeros(SR // 2, dtype=np.int16)
+    parts, refs, n, i = [], [], 0, 0
+    while n < seconds * SR:
+        _, audio, ref = fixtures[i % len(fixtures)]
+        parts += [audio, pause]
+        refs.append(ref)
+        n += len(audio) + len(pause)
+        i += 1
+    has_refs = all(r is not None for r in refs)
+    return np.concatenate(parts), (" ".join(refs) if has_refs else None)
+
+
+def run(fixtures, lengths, batch_chunks):
+    from models.whisper import Whisper
+    whisper = Whisper(batch_chunks=batch_chunks)
+    whisper.transcribe(fixtures[0][1])  # warm-up, not timed
+
+    print(f"{'audio_s':>7} {'chunks':>6} {'single_ms':>9} {'chunked_ms':>10} {'single_words':>12} "
+          f"{'chunked_words':>13} {'single_wer':>10} {'chunked_wer':>11}")
+    for seconds in lengths:
+        audio, ref = long_audio(fixtures, seconds)
+        t0 = time.perf_counter()
+        single = whisper._generate([audio], SR)[0]  # what transcribe() did before
+        single_ms = 1000.0 * (time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        out = whisper.transcribe_long(audio, SR)
+        chunked_ms = 1000.0 * (time.perf_counter() - t0)
+        sw = f"{wer([ref], [single]):>10.3f}" if ref else f"{'-':>10}"
+        cw = f"{wer([ref], [out['text']]):>11.3f}" if ref else f"{'-':>11}"
+        print(f"{len(audio) / SR:>7.1f} {len(out['chunks']):>6} {single_ms:>9.0f} {chunked_ms:>10.0f} "
+              f"{len(single.split()):>12} {len(out['text'].split()):>13} {sw} {cw}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Long-form Whisper: truncated single call vs chunked.")
+    ap.add_argument("--wavs", help="directory of 16-bit WAV fixtures (+ optional .txt transcripts)")
+    ap.add_argument("--seconds", default="20,40,80,160")
+    ap.add_argument("--batch-chunks", type=int, default=8)
+    args = ap.parse_args()
+    fixtures = load_fixtures(args.wavs) if args.wavs else synthetic_fixtures()
+    run(fixtures, [float(s) for s in args.seconds.split(",")], args.batch_chunks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Memory/allocations of the per-utterance float conversions on long calls.
+# legacy: each stage converts the int16 utterance itself (Whisper and wav2vec processors via
+#         np.asarray(..., float32), compute_audio_summary via astype(float32) / 32768), with the
+#         three stages running at the same time;
+# shared: the pipeline converts once (models/pcm.py::as_float32) and every stage reuses it.
+# Peak traced memory comes from tracemalloc (NumPy reports its buffers to it).
+#
+#   python -m bench.memory_bench [--minutes 1,5,15,30] [--real-extractors]
+#
+# --real-extractors also runs the real Whisper/Wav2Vec2 feature extractors (needs transformers).
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from models.audio_summary import compute_audio_summary
+from models.pcm import as_float32
+
+SR = 16000
+
+
+def legacy_inputs(audio):
+    """The three independent conversions of the old pipeline, alive at the same time."""
+    return [np.asarray(audio, dtype=np.float32),          # Whisper processor
+            np.asarray(audio, dtype=np.float32),          # wav2vec processor
+            audio.astype(np.float32) / 32768.0]           # compute_audio_summary
+
+
+def shared_inputs(audio):
+    x = as_float32(audio)
+    return [np.asarray(x, dtype=np.float32), np.asarray(x, dtype=np.float32), as_float32(x)]
+
+
+def _measure(fn):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    out = fn()
+    ms = 1000.0 * (time.perf_counter() - t0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del out
+    return peak / 2**20, ms
+
+
+def _extractors():
+    from transformers import WhisperFeatureExtractor, Wav2Vec2FeatureExtractor
+    whisper_fe = WhisperFeatureExtractor()
+    wav2vec_fe = Wav2Vec2FeatureExtractor(do_normalize=True, return_attention_mask=True)
+    return (lambda a: whisper_fe(a, sampling_rate=SR, return_tensors="np"),
+            lambda a: wav2vec_fe(a, sampling_rate=SR, return_tensors="np"))
+
+
+def run(minutes, real_extractors=False):
+    fes = _extractors() if real_extractors else None
+    print(f"{'minutes':>7} {'audio_mb':>8} {'legacy_peak_mb':>14} {'shared_peak_mb':>14} "
+          f"{'legacy_ms':>9} {'shared_ms':>9}  stage")
+    for m in minutes:
+        audio = (np.random.default_rng(0).standard_normal(int(m * 60 * SR)) * 3000).astype(np.int16)
+        audio_mb = audio.nbytes / 2**20
+        rows = [("conversions", lambda: legacy_inputs(audio), lambda: shared_inputs(audio))]
+        rows.append(("+ audio_summary",
+                     lambda: (legacy_inputs(audio), compute_audio_summary(audio, sr=SR)),
+                     lambda: (shared_inputs(audio), compute_audio_summary(as_float32(audio), sr=SR))))
+        if fes:
+            whisper_fe, wav2vec_fe = fes
+            rows.append(("+ feature extractors",
+                         lambda: [whisper_fe(audio), wav2vec_fe(audio)],
+                         lambda: (lambda x: [whisper_fe(x), wav2vec_fe(x)])(as_float32(audio))))
+        for label, legacy, shared in rows:
+            lp, lms = _measure(legacy)
+            sp, sms = _measure(shared)
+            print(f"{m:>7g} {audio_mb:>8.1f} {lp:>14.1f} {sp:>14.1f} {lms:>9.1f} {sms:>9.1f}  {label}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-utterance float buffer memory: legacy vs shared.")
+    ap.add_argument("--minutes", default="1,5,15,30")
+    ap.add_argument("--real-extractors", action="store_true")
+    args = ap.parse_args()
+    run([float(m) for m in args.minutes.split(",")], args.real_extractors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Replays a directory of recordings as N concurrent calls at real-time pace, through the
+# real capture path (AudioRecorder VAD/endpointing on an audio/sources.py ArraySource) and
+# a shared ParallelPipeline. Per call and per turn it reports:
+#   eos_ms       end of speech (last speech frame captured) -> pipeline results
+#                (includes the silence_limit endpointing wait)
+#   endpoint_ms  end-of-turn detected -> pipeline results
+#   trimmed_s    non-speech left out of ASR/emotion by the pipeline's VAD trimming
+#
+#   python -m bench.replay_calls [--wavs DIR] [--calls 8] [--batch] [--stagger-ms 250]
+#   python -m bench.replay_calls --real      # real models from the registry (needs weights)
+#
+# Call i replays fixture i % len(fixtures). Without --real, the toy models of
+# bench/batching_bench.py stand in for Whisper and wav2vec.
+
+import argparse
+import contextlib
+import io
+import threading
+import time
+
+import numpy as np
+
+from audio.recorder import AudioRecorder
+from audio.sources import ArraySource
+from bench.batching_bench import ToyWav2Vec, ToyWhisper
+from bench.fixtures import SR, load_fixtures, synthetic_fixtures
+from pipeline.batching import BatchedWav2Vec, BatchedWhisper
+from pipeline.parallel_pipeline import ParallelPipeline
+
+
+class ToyBert:
+    def analyze(self, text):
+        return {"label": "NEUTRAL", "score": 1.0}
+
+
+def replay_call(audio, pipeline, start_timeout_s=2.0):
+    """Turns of one call: [{"audio_s", "eos_ms", "endpoint_ms", "trimmed_s"}]."""
+    source = ArraySource(audio, realtime=True)
+    recorder = AudioRecorder(sample_rate=SR, source=source, start_timeout_s=start_timeout_s)
+    turns = []
+    while not recorder.exhausted:
+        utterance = recorder.record_until_silence()
+        timing = recorder.last_timing
+        if timing["onset"] is None:
+            continue  # only silence left
+        out = pipeline.process(utterance, audio_summary=recorder.last_summary,
+                               speech_span=recorder.last_speech_span)
+        done = time.monotonic()
+        trim = out["pipeline_stats"].get("trim") or {"trimmed_ms": 0.0}
+        turns.append({"audio_s": len(utterance) / SR,
+                      "eos_ms": 1000.0 * (done - timing["speech_end"]),
+                      "endpoint_ms": 1000.0 * (done - timing["endpoint"]),
+                      "trimmed_s": trim["trimmed_ms"] / 1000.0})
+    return turns
+
+
+def run(fixtures, calls, real=False, batch=False, stagger_ms=0.0):
+    if real:
+        from models.registry import MODELS
+        MODELS.load_all()
+        whisper, bert, wav2vec = MODELS.get("whisper"), MODELS.get("bert"), MODELS.get("wav2vec")
+    else:
+        whisper, bert, wav2vec = ToyWhisper(), ToyBert(), ToyWav2Vec()
+    if batch:
+        whisper, wav2vec = BatchedWhisper(whisper), BatchedWav2Vec(wav2vec)
+
+    results = [None] * calls
+
+    def call(i):
+        time.sleep(i * stagger_ms / 1000.0)
+        results[i] = replay_call(fixtures[i % len(fixtures)][1], pipeline)
+
+    t0 = time.perf_counter()
+    with ParallelPipeline(whisper, bert, wav2vec, sample_rate_hz=SR, concurrency=calls) as pipeline, \
+            contextlib.redirect_stdout(io.StringIO()):  # silence the recorders' prompts
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(calls)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - t0
+    if batch:
+        whisper.close()
+        wav2vec.close()
+
+    print(f"{'call':>4} {'fixture':<24} {'turns':>5} {'audio_s':>7} {'trimmed_s':>9} {'eos_ms':>8} "
+          f"{'max_eos_ms':>10} {'endpoint_ms':>11}")
+    for i, turns in enumerate(results):
+        name = fixtures[i % len(fixtures)][0]
+        if not turns:
+            print(f"{i:>4} {name:<24} {0:>5}  (no speech detected)")
+            continue
+        eos = [t["eos_ms"] for t in turns]
+        end = [t["endpoint_ms"] for t in turns]
+        print(f"{i:>4} {name:<24} {len(turns):>5} {sum(t['audio_s'] for t in turns):>7.1f} "
+              f"{sum(t['trimmed_s'] for t in turns):>9.1f} {np.mean(eos):>8.0f} {max(eos):>10.0f} "
+              f"{np.mean(end):>11.0f}")
+    eos = np.array([t["eos_ms"] for turns in results for t in turns])
+    if len(eos):
+        print(f"\n{calls} calls, {len(eos)} turns in {wall:.1f} s: end-of-speech -> results "
+              f"p50 {np.percentile(eos, 50):.0f} ms, p95 {np.percentile(eos, 95):.0f} ms")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay recordings as concurrent real-time calls.")
+    ap.add_argument("--wavs", help="directory of 16-bit WAV recordings (one call each)")
+    ap.add_argument("--calls", type=int, default=8, help="concurrent calls")
+    ap.add_argument("--stagger-ms", type=float, default=0.0, help="delay between call starts")
+    ap.add_argument("--batch", action="store_true", help="micro-batch Whisper/wav2vec across calls")
+    ap.add_argument("--real", action="store_true", help="use the real models (slow, needs weights)")
+    args = ap.parse_args()
+    fixtures = load_fixtures(args.wavs) if args.wavs else synthetic_fixtures()
+    run(fixtures, args.calls, args.real, args.batch, args.stagger_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# Word error rate for the ASR benchmarks (French-friendly normalization).
+
+import re
+import unicodedata
+
+_PUNCT = re.compile(r"[^\w\s']")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFC", (text or "").lower()).replace("’", "'")
+    return _PUNCT.sub(" ", text).split()
+
+
+def word_errors(ref, hyp):
+    """(edit distance in words, reference length) after normalize()."""
+    r, h = normalize(ref), normalize(hyp)
+    prev = list(range(len(h) + 1))
+    for i, rw in enumerate(r, 1):
+        cur = [i] + [0] * len(h)
+        for j, hw in enumerate(h, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (rw != hw))
+        prev = cur
+    return prev[-1], len(r)
+
+
+def wer(refs, hyps):
+    """Corpus WER: total word edits / total reference words."""
+    errors = words = 0
+    for ref, hyp in zip(refs, hyps):
+        e, n = word_errors(ref, hyp)
+        errors, words = errors + e, words + n
+    return errors / words if words else 0.0
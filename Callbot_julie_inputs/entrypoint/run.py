@@ -1,23 +1,88 @@
+import threading
+
 from audio.recorder import AudioRecorder
-from models.whisper import Whisper
-from models.bert_sentiment import BertSentiment
-from models.wav2vec_sentiment import Wav2VecSentiment
+from models.registry import MODELS
 from pipeline.parallel_pipeline import ParallelPipeline
+from pipeline.streaming_asr import StreamingTranscriber
+from pipeline.batching import BatchedWhisper, BatchedWav2Vec, BatchedBert
+
+
+_PIPELINE = None
+_PIPELINE_LOCK = threading.Lock()
+_PIPELINE_OPTIONS = {}
+
+
+def configure_pipeline(batching=None, **options):
+    """Options for the process-wide pipeline that run_inputs uses (same as get_pipeline);
+    must be called before it is built, e.g. configure_pipeline(concurrency=16)."""
+    with _PIPELINE_LOCK:
+        if _PIPELINE is not None:
+            raise ValueError("the inputs pipeline is already built.")
+        if batching is not None:
+            _PIPELINE_OPTIONS["batching"] = batching
+        _PIPELINE_OPTIONS.update(options)
+
+
+def get_pipeline(batching=None, **options):
+    """Process-wide ParallelPipeline (its stage executors are created once).
+    batching={"max_batch": 8, "max_wait_ms": 10} batches Whisper, wav2vec and BERT across
+    concurrent calls. batching and options (torch_threads, timeouts_s, raise_errors,
+    concurrency: calls in flight per stage, default 4) only apply on the first call, on
+    top of configure_pipeline()."""
+    global _PIPELINE
+    with _PIPELINE_LOCK:
+        if _PIPELINE is None:
+            options = {**_PIPELINE_OPTIONS, **options}
+            configured_batching = options.pop("batching", None)
+            batching = batching if batching is not None else configured_batching
+            whisper, bert, wav2vec = MODELS.get("whisper"), MODELS.get("bert"), MODELS.get("wav2vec")
+            if batching is not None:
+                whisper, wav2vec = BatchedWhisper(whisper, **batching), BatchedWav2Vec(wav2vec, **batching)
+                bert = BatchedBert(bert, **batching)
+                options.setdefault("concurrency", batching.get("max_batch", 8))
+            _PIPELINE = ParallelPipeline(whisper, bert, wav2vec, **options)
+    return _PIPELINE
+
+
+def preload_inputs(parallel=True, warmup=True, backend=None):
+    """Load Whisper, BERT and wav2vec once at startup (optionally in parallel) and warm them up.
+    backend: "torch", "int8" or "onnx" for all three (models/backends.py).
+    Returns per-model load time, weights size and warm-up time."""
+    if backend is not None:
+        MODELS.configure_backend(backend)
+    MODELS.load_all(parallel=parallel)
+    if warmup:
+        MODELS.warmup()
+    return MODELS.stats()
 
 
+def run_inputs(streaming=False, on_partial=None, recorder=None):
+    """
+    streaming=True transcribes VAD segments while the caller speaks; only the last
+    segment is decoded after silence. on_partial(index, segment_text, text_so_far)
+    receives partial transcripts. recorder: reuse one AudioRecorder across the turns of a
+    call, e.g. AudioRecorder(source=WavFileSource(path)) (audio/sources.py); by default a
+    new microphone recorder is made.
+    """
 
-def run_inputs():
+    recorder = recorder if recorder is not None else AudioRecorder()
+    # Shared models and executors: loaded once per process (see preload_inputs)
+    pipeline = get_pipeline()
 
-    recorder = AudioRecorder()
-    whisper = Whisper()
-    bert = BertSentiment()
-    wav2vec = Wav2VecSentiment()
-    pipeline = ParallelPipeline(whisper, bert, wav2vec)
+    if not streaming:
+        # Record until silence
+        audio = recorder.record_until_silence()
 
-    # Record until silence
-    audio = recorder.record_until_silence()
+        # Process in parallel
+        results = pipeline.process(audio, audio_summary=recorder.last_summary,
+                                   speech_span=recorder.last_speech_span)
+        return results
 
-    # Process in parallel
-    results = pipeline.process(audio)
+    transcriber = StreamingTranscriber(pipeline.whisper, sr=recorder.sample_rate, on_partial=on_partial)
+    try:
+        audio = recorder.record_until_silence(on_segment=transcriber.feed)
+        results = pipeline.process(audio, transcriber=transcriber, audio_summary=recorder.last_summary,
+                                   speech_span=recorder.last_speech_span)
+    finally:
+        transcriber.close()
     return results
-    
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .bert_sentiment import BertSentiment
 from .wav2vec_sentiment import Wav2VecSentiment
-from .whisper import Whisper
\ No newline at end of file
+from .whisper import Whisper
+from .registry import ModelRegistry, MODELS
\ No newline at end of file
@@ -1,41 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-def compute_audio_summary(audio_np: np.ndarray, sr: int = 16000, zones: int = 4,
-                                  frame_ms: int = 25, hop_ms: int = 10,
-                                  spike_z: float = 2.5, silence_rms: float = 0.01) -> dict:
-    if audio_np is None or audio_np.size == 0:
-        return {
-            "sample_rate_hz": sr,
-            "duration_ms": 0,
-            "num_zones": zones,
-            "global_peak_zone": 0,
-            "global_peak_zscore": 0.0,
-            "peak_zscore_by_zone": [0.0] * zones,
-            "spike_count_by_zone": [0] * zones,
-            "silence_ratio": 1.0,
-            "clipping_ratio": 0.0,
-        }
-
-    # normalize waveform [-1,1]
-    x = audio_np.astype(np.float32) / 32768.0
-    duration_ms = int(round(1000.0 * len(x) / sr))
-
-    # clipping ratio (saturation)
-    clipping_ratio = float(np.mean(np.abs(audio_np) >= 32760))
+from .pcm import as_float32, count_clipped, CLIP_LEVEL, PCM16_SCALE
 
-    # RMS envelope
-    frame = max(1, int(sr * frame_ms / 1000))
-    hop = max(1, int(sr * hop_ms / 1000))
 
+def rms_envelope(x: np.ndarray, frame: int, hop: int) -> np.ndarray:
+    """
+    RMS of each `frame`-sample window every `hop` samples (float32, one value if x < frame).
+    Squares once and reduces strided window views of x*x: same float32 sums as a
+    per-window loop, without a Python loop or a (windows x frame) temporary.
+    """
     if len(x) < frame:
-        rms = np.array([float(np.sqrt(np.mean(x * x) + 1e-12))], dtype=np.float32)
-    else:
-        n_frames = 1 + (len(x) - frame) // hop
-        rms = np.empty(n_frames, dtype=np.float32)
-        for i in range(n_frames):
-            w = x[i * hop : i * hop + frame]
-            rms[i] = float(np.sqrt(np.mean(w * w) + 1e-12))
+        return np.array([float(np.sqrt(np.mean(x * x) + 1e-12))], dtype=np.float32)
+
+    energy = sliding_window_view(x * x, frame)[::hop]
+    return np.sqrt(np.mean(energy, axis=1) + 1e-12).astype(np.float32, copy=False)
+
+
+def _empty_summary(sr: int, zones: int) -> dict:
+    return {
+        "sample_rate_hz": sr,
+        "duration_ms": 0,
+        "num_zones": zones,
+        "global_peak_zone": 0,
+        "global_peak_zscore": 0.0,
+        "peak_zscore_by_zone": [0.0] * zones,
+        "spike_count_by_zone": [0] * zones,
+        "silence_ratio": 1.0,
+        "clipping_ratio": 0.0,
+    }
+
 
+def summarize_envelope(rms: np.ndarray, sr: int, duration_ms: int, clipping_ratio: float,
+                       zones: int = 4, spike_z: float = 2.5, silence_rms: float = 0.01) -> dict:
+    """Summary dict from a finished RMS envelope (shared by the batch and streaming paths)."""
     silence_ratio = float(np.mean(rms < silence_rms))
 
     # z-score energy (spikes)
@@ -72,3 +71,153 @@ def compute_audio_summary(audio_np: np.ndarray, sr: int = 16000, zones: int = 4,
         "silence_ratio": round(silence_ratio, 3),
         "clipping_ratio": round(clipping_ratio, 3),
     }
+
+
+def compute_audio_summary(audio_np: np.ndarray, sr: int = 16000, zones: int = 4,
+                                  frame_ms: int = 25, hop_ms: int = 10,
+                                  spike_z: float = 2.5, silence_rms: float = 0.01) -> dict:
+    if audio_np is None or audio_np.size == 0:
+        return _empty_summary(sr, zones)
+
+    # normalize waveform [-1,1] (no copy when given the pipeline's shared float32 buffer)
+    x = as_float32(audio_np)
+    duration_ms = int(round(1000.0 * len(x) / sr))
+
+    # clipping ratio (saturation), same threshold whether given int16 or float samples
+    clipping_ratio = count_clipped(x) / len(x)
+
+    # RMS envelope
+    frame = max(1, int(sr * frame_ms / 1000))
+    hop = max(1, int(sr * hop_ms / 1000))
+
+    rms = rms_envelope(x, frame, hop)
+
+    return summarize_envelope(rms, sr, duration_ms, clipping_ratio, zones, spike_z, silence_rms)
+
+
+class AudioSummaryAccumulator:
+    """
+    compute_audio_summary fed frame by frame during capture (AudioRecorder).
+    Clipping/silence counts are running totals; the RMS envelope (100 values/s) is kept so
+    summary() gives exactly the batch result without touching the samples again.
+    Every per-frame step writes into buffers allocated up front: the float32 scratch and
+    the two pending-window buffers (sized for chunks up to `max_chunk` samples, grown once
+    if a larger chunk arrives) and the envelope (sized from `max_samples`, doubled if a
+    recording runs past it).
+    """
+
+    def __init__(self, sr: int = 16000, zones: int = 4, frame_ms: int = 25, hop_ms: int = 10,
+                 spike_z: float = 2.5, silence_rms: float = 0.01,
+                 max_samples: int = None, max_chunk: int = None):
+        self.sr = sr
+        self.zones = zones
+        self.spike_z = spike_z
+        self.silence_rms = silence_rms
+        self.frame = max(1, int(sr * frame_ms / 1000))
+        self.hop = max(1, int(sr * hop_ms / 1000))
+        self._alloc_chunk(max_chunk or sr)
+        self._env = np.empty((max_samples or 60 * sr) // self.hop + 1, dtype=np.float32)
+        self.reset()
+
+    def _alloc_chunk(self, max_chunk: int) -> None:
+        size = self.frame + max_chunk
+        keep = self._pending if hasattr(self, "_pend") else None
+        self._pend = [np.empty(size, dtype=np.float32), np.empty(size, dtype=np.float32)]
+        self._scratch = np.empty(size, dtype=np.float32)
+        self._flags = np.empty(size, dtype=bool)
+        if keep is not None:
+            self._pend[0][:len(keep)] = keep
+            self._which = 0
+
+    def reset(self) -> None:
+        self.num_samples = 0
+        self.clipped = 0
+        self.silent_windows = 0
+        self.peak_rms = 0.0
+        self._which = 0       # pending samples (from the next window start on) are
+        self._fill = 0        # self._pend[self._which][:self._fill]
+        self._n_env = 0       # RMS values in self._env
+
+    @property
+    def _pending(self) -> np.ndarray:
+        return self._pend[self._which][:self._fill]
+
+    def add(self, frame) -> None:
+        """Add one chunk of int16 PCM (bytes or ndarray)."""
+        pcm = np.frombuffer(frame, dtype=np.int16) if isinstance(frame, (bytes, bytearray)) else frame
+        n = pcm.size
+        if n == 0:
+            return
+        if self._fill + n > len(self._scratch):
+            self._alloc_chunk(n)
+        self.num_samples += n
+
+        # int16 -> float32 straight into the pending buffer (same values as as_float32)
+        pend = self._pend[self._which]
+        x = pend[self._fill:self._fill + n]
+        if pcm.dtype == np.int16:
+            np.divide(pcm, np.float32(PCM16_SCALE), out=x, dtype=np.float32)
+        else:
+            x[:] = as_float32(pcm)
+        np.abs(x, out=self._scratch[:n])
+        self.clipped += int(np.count_nonzero(np.greater_equal(self._scratch[:n], CLIP_LEVEL,
+                                                              out=self._flags[:n])))
+        self._fill += n
+        if self._fill < self.frame:
+            return
+
+        # RMS of every complete window, as rms_envelope computes it
+        fill = self._fill
+        windows = (fill - self.frame) // self.hop + 1
+        if self._n_env + windows > len(self._env):
+            self._env = np.concatenate((self._env, np.empty_like(self._env)))
+        sq = np.multiply(pend[:fill], pend[:fill], out=self._scratch[:fill])
+        rms = self._env[self._n_env:self._n_env + windows]
+        np.mean(sliding_window_view(sq, self.frame)[::self.hop], axis=1, out=rms)
+        np.add(rms, 1e-12, out=rms)
+        np.sqrt(rms, out=rms)
+        self._n_env += windows
+        self.silent_windows += int(np.count_nonzero(np.less(rms, self.silence_rms,
+                                                            out=self._flags[:windows])))
+        self.peak_rms = max(self.peak_rms, float(rms.max()))
+
+        # keep the samples from the next window start on, in the other pending buffer
+        used = windows * self.hop
+        other = 1 - self._which
+        self._pend[other][:fill - used] = pend[used:fill]
+        self._which, self._fill = other, fill - used
+
+    @property
+    def duration_ms(self) -> int:
+        return int(round(1000.0 * self.num_samples / self.sr))
+
+    @property
+    def silence_ratio(self) -> float:
+        return self.silent_windows / self._n_env if self._n_env else 1.0
+
+    @property
+    def clipping_ratio(self) -> float:
+        return self.clipped / self.num_samples if self.num_samples else 0.0
+
+    def summary(self) -> dict:
+        """Same dict as compute_audio_summary on everything added so far."""
+        if self.num_samples == 0:
+            return _empty_summary(self.sr, self.zones)
+        if self._n_env:
+            rms = self._env[:self._n_env]
+        else:  # shorter than one window: RMS over all samples, as the batch function does
+            rms = rms_envelope(self._pending, self.frame, self.hop)
+        return summarize_envelope(rms, self.sr, self.duration_ms, self.clipping_ratio,
+                                  self.zones, self.spike_z, self.silence_rms)
+
+
+def compute_audio_summary_batch(audios, sr: int = 16000, max_workers: int = 4, **kwargs) -> list:
+    """
+    compute_audio_summary over many recordings (offline analytics), in input order.
+    NumPy releases the GIL in the heavy parts, so recordings are summarized on a thread pool.
+    """
+    audios = list(audios)
+    if max_workers <= 1 or len(audios) <= 1:
+        return [compute_audio_summary(a, sr=sr, **kwargs) for a in audios]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(audios))) as ex:
+        return list(ex.map(lambda a: compute_audio_summary(a, sr=sr, **kwargs), audios))
@@ -0,0 +1,58 @@
+# CPU inference backends shared by the inputs models.
+#   "torch": fp32 PyTorch (default)
+#   "int8":  PyTorch dynamic int8 quantization of the Linear layers (CPU only)
+#   "onnx":  ONNX Runtime through optimum; the export is cached on disk and reused
+import os
+
+import torch
+
+BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "callbot_julie", "onnx")
+
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}.")
+
+
+def model_device(backend):
+    # Quantized and ONNX Runtime models run on CPU; fp32 uses the GPU when there is one.
+    return "cuda" if backend == "torch" and torch.cuda.is_available() else "cpu"
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of every nn.Linear (weights int8, activations quantized on the fly)."""
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def onnx_export_dir(model_id, cache_dir=None):
+    return os.path.join(cache_dir or DEFAULT_ONNX_CACHE_DIR, model_id.replace("/", "--"))
+
+
+def load_onnx(ort_class, model_id, cache_dir=None):
+    """
+    optimum.onnxruntime.<ort_class> for model_id: exported once to the cache dir, then loaded
+    from there on later runs. Requires `optimum[onnxruntime]`.
+    """
+    try:
+        from optimum import onnxruntime as ort
+    except ImportError as e:
+        raise ImportError("the onnx backend needs `pip install optimum[onnxruntime]`.") from e
+    cls = getattr(ort, ort_class)
+    path = onnx_export_dir(model_id, cache_dir)
+    if os.path.isdir(path) and any(f.endswith(".onnx") for f in os.listdir(path)):
+        return cls.from_pretrained(path)
+    model = cls.from_pretrained(model_id, export=True)
+    model.save_pretrained(path)
+    return model
+
+
+def onnx_size_mb(model_id, cache_dir=None):
+    """Size on disk of the cached ONNX export (0.0 if not exported yet)."""
+    path = onnx_export_dir(model_id, cache_dir)
+    if not os.path.isdir(path):
+        return 0.0
+    total = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+                if os.path.isfile(os.path.join(path, f)))
+    return round(total / 2**20, 1)
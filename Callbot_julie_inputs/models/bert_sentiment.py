@@ -1,9 +1,93 @@
-from transformers import pipeline
+from collections import OrderedDict
+import re
+import threading
+
+from transformers import AutoTokenizer, pipeline
+
+from .backends import check_backend, quantize_int8, load_onnx
+
+# modèle par défaut : cmarkea/distilcamembert-base-sentiment (PyTorch, labels "1 star".."5 stars").
+# tblard/tf-allocine est TensorFlow uniquement : pas de backend int8/onnx ni de vrai batching.
+
+NEUTRAL = {"label": "NEUTRAL", "score": 1.0}
+
+_WS = re.compile(r"\s+")
+_EDGE_PUNCT = " \t\n.,;:!?…\"'«»-"
+
+
+def normalize_text(text):
+    return _WS.sub(" ", (text or "").lower()).strip(_EDGE_PUNCT)
+
 
-# on peut utiliser un autre modèle plus rapide (cmarkea/distilcamembert-base-sentiment)
 class BertSentiment:
-    def __init__(self, model_id="tblard/tf-allocine"): 
+    """
+    Text sentiment ({"label", "score"}) with:
+    - NEUTRAL for texts shorter than `min_chars` once normalized (empty, "ok", "oui", "euh."),
+      without calling the model;
+    - a bounded LRU cache (`cache_size` entries, 0 = off) keyed on the normalized text;
+    - analyze_batch: inputs truncated to `max_length` tokens and sorted by length, so each
+      batch of `batch_size` pads to similar lengths.
+    """
+
+    def __init__(self, model_id="cmarkea/distilcamembert-base-sentiment", backend="torch",
+                 onnx_cache_dir=None, max_length=128, batch_size=16, min_chars=4, cache_size=1024):
+        # backend "int8"/"onnx" (backends.py) need a PyTorch checkpoint
+        check_backend(backend)
+        self.backend = backend
+        self.max_length = max_length
+        self.batch_size = max(1, int(batch_size))
+        self.min_chars = min_chars
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"texts": 0, "neutral": 0, "cache_hits": 0, "model_texts": 0}
+        if backend == "onnx":
+            model = load_onnx("ORTModelForSequenceClassification", model_id, onnx_cache_dir)
+            self.pipe = pipeline("sentiment-analysis", model=model,
+                                 tokenizer=AutoTokenizer.from_pretrained(model_id))
+            return
         self.pipe = pipeline("sentiment-analysis", model=model_id)
+        if backend == "int8":
+            if self.pipe.framework != "pt":
+                raise ValueError(f"backend 'int8' needs a PyTorch model, {model_id} is {self.pipe.framework}.")
+            self.pipe.model = quantize_int8(self.pipe.model)
 
     def analyze(self, text):
-        return self.pipe(text)[0]
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts):
+        """One result dict per text, in order."""
+        results = [None] * len(texts)
+        todo = {}  # normalized text -> (text given to the model, indices)
+        with self._cache_lock:
+            self.stats["texts"] += len(texts)
+            for i, text in enumerate(texts):
+                key = normalize_text(text)
+                if len(key) < self.min_chars:
+                    results[i] = dict(NEUTRAL)
+                    self.stats["neutral"] += 1
+                elif key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[i] = dict(self._cache[key])
+                    self.stats["cache_hits"] += 1
+                else:
+                    todo.setdefault(key, (text.strip(), []))[1].append(i)
+
+        if todo:
+            keys = sorted(todo, key=lambda k: len(todo[k][0]))  # length buckets
+            outputs = self.pipe([todo[k][0] for k in keys], batch_size=self.batch_size,
+                                truncation=True, max_length=self.max_length)
+            with self._cache_lock:
+                self.stats["model_texts"] += len(keys)
+                for key, out in zip(keys, outputs):
+                    for i in todo[key][1]:
+                        results[i] = dict(out)
+                    if self.cache_size > 0:
+                        self._cache[key] = out
+                        if len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+        return results
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
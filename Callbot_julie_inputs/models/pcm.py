@@ -0,0 +1,32 @@
+# Shared normalized audio buffer for the inputs stages.
+# The pipeline converts each int16 utterance once and hands the same read-only float32
+# array to Whisper, wav2vec and compute_audio_summary.
+
+import numpy as np
+
+PCM16_SCALE = 32768.0
+# |int16| >= 32760 counts as saturated; -32768 included (np.abs overflows on it in int16)
+CLIP_LEVEL = 32760 / PCM16_SCALE
+
+
+def as_float32(audio):
+    """
+    int16 PCM -> read-only float32 in [-1, 1]. float32 input is returned as is (no copy),
+    so every stage can call this on whatever it is given; other float inputs (float64
+    arrays, lists of floats) are converted to float32 as they are.
+    """
+    audio = np.asarray(audio)
+    if audio.dtype == np.float32:
+        return audio
+    if np.issubdtype(audio.dtype, np.floating):
+        return audio.astype(np.float32)
+    if audio.dtype != np.int16:
+        raise ValueError(f"expected int16 PCM or float audio, got {audio.dtype}.")
+    x = np.divide(audio, np.float32(PCM16_SCALE), dtype=np.float32)
+    x.flags.writeable = False
+    return x
+
+
+def count_clipped(x):
+    """Samples of a float32 buffer (as_float32) at or past CLIP_LEVEL, either sign."""
+    return int(np.count_nonzero(np.abs(x) >= CLIP_LEVEL))
@@ -0,0 +1,131 @@
+# Process-wide registry of the inputs models (Whisper, BERT, wav2vec).
+# Each model is built once and shared; load_all() can load them in parallel at startup and
+# warmup() runs one dummy inference so the first real call is not cold.
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import numpy as np
+
+from .whisper import Whisper
+from .bert_sentiment import BertSentiment
+from .wav2vec_sentiment import Wav2VecSentiment
+
+
+def _torch_module(model):
+    """The underlying torch module of a wrapper (Whisper/Wav2VecSentiment .model, BertSentiment .pipe.model)."""
+    module = getattr(model, "model", None)
+    if module is None:
+        module = getattr(getattr(model, "pipe", None), "model", None)
+    return module
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, (tuple, list)):  # packed (weight, bias) of dynamically quantized Linear
+        return sum(_nbytes(v) for v in value)
+    if hasattr(value, "numel") and hasattr(value, "element_size"):
+        return value.numel() * value.element_size()
+    return 0
+
+
+def _weights_mb(model) -> float:
+    """Size of the torch weights (state_dict, so int8 packed weights count at 1 byte); 0.0 for ONNX."""
+    module = _torch_module(model)
+    if module is None or not hasattr(module, "state_dict"):
+        return 0.0
+    return round(sum(_nbytes(v) for v in module.state_dict().values()) / 2**20, 1)
+
+
+_SILENCE = np.zeros(16000, dtype=np.float32)  # 1 s at 16 kHz
+
+# name -> (factory, dummy inference)
+DEFAULT_MODELS = {
+    "whisper": (Whisper, lambda m: m.transcribe(_SILENCE)),
+    "bert": (BertSentiment, lambda m: m.analyze("bonjour")),
+    "wav2vec": (Wav2VecSentiment, lambda m: m.analyze(_SILENCE)),
+}
+
+
+class ModelRegistry:
+    def __init__(self, models=None):
+        self._specs = dict(models or DEFAULT_MODELS)
+        self._instances = {}
+        self._locks = {name: threading.Lock() for name in self._specs}
+        self._options = {name: {} for name in self._specs}
+        self._stats = {name: {"loaded": False} for name in self._specs}
+
+    def _spec(self, name):
+        if name not in self._specs:
+            raise ValueError(f"unknown model {name!r}, expected one of {tuple(self._specs)}.")
+        return self._specs[name]
+
+    def configure(self, name, **kwargs):
+        """Constructor kwargs for `name` (e.g. backend="int8"); must be set before it is loaded."""
+        self._spec(name)
+        if name in self._instances:
+            raise ValueError(f"model {name!r} is already loaded.")
+        self._options[name].update(kwargs)
+
+    def configure_backend(self, backend, names=None):
+        """Same inference backend ("torch", "int8", "onnx") for every model (or `names`)."""
+        for name in names or self._specs:
+            self.configure(name, backend=backend)
+
+    def get(self, name):
+        """Shared instance of `name`, built on first use (thread-safe, built once)."""
+        model = self._instances.get(name)
+        if model is not None:
+            return model
+        factory, _ = self._spec(name)
+        with self._locks[name]:
+            model = self._instances.get(name)
+            if model is None:
+                t0 = time.perf_counter()
+                model = factory(**self._options[name])
+                self._stats[name].update(loaded=True,
+                                         backend=getattr(model, "backend", None),
+                                         load_s=round(time.perf_counter() - t0, 3),
+                                         weights_mb=_weights_mb(model))
+                self._instances[name] = model
+        return model
+
+    def load_all(self, names=None, parallel: bool = True) -> dict:
+        """Load every model (or `names`); parallel=True loads them on one thread each."""
+        names = list(names or self._specs)
+        t0 = time.perf_counter()
+        if parallel and len(names) > 1:
+            with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="model-load") as ex:
+                list(ex.map(self.get, names))
+        else:
+            for name in names:
+                self.get(name)
+        self._wall("load_all_s", t0)
+        return self.stats()
+
+    def warmup(self, names=None) -> dict:
+        """Run one dummy inference per model (loads it first if needed)."""
+        names = list(names or self._specs)
+        t0 = time.perf_counter()
+        for name in names:
+            _, dummy = self._spec(name)
+            model = self.get(name)
+            t1 = time.perf_counter()
+            dummy(model)
+            self._stats[name]["warmup_s"] = round(time.perf_counter() - t1, 3)
+        self._wall("warmup_s", t0)
+        return self.stats()
+
+    def _wall(self, key: str, t0: float) -> None:
+        self._stats.setdefault("_total", {})[key] = round(time.perf_counter() - t0, 3)
+
+    def stats(self) -> dict:
+        """Per model: loaded, backend, load_s, weights_mb (torch state_dict), warmup_s."""
+        return {name: dict(s) for name, s in self._stats.items()}
+
+    def clear(self) -> None:
+        self._instances.clear()
+        self._stats = {name: {"loaded": False} for name in self._specs}
+
+
+MODELS = ModelRegistry()
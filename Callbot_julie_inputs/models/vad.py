@@ -0,0 +1,69 @@
+# webrtcvad frame decisions over a finished utterance, leading/trailing silence trimming
+# and long-form split points. Whisper sees at most 30 s per input; longer audio is cut
+# where the caller pauses, and only when a stretch has no pause at all is it hard-cut
+# with an overlap.
+
+import numpy as np
+
+from .pcm import as_float32, PCM16_SCALE
+
+
+def speech_flags(audio, sr=16000, frame_ms=30, aggressiveness=2):
+    """One webrtcvad decision per `frame_ms` frame (bool array; a partial last frame is dropped)."""
+    import webrtcvad  # also used by the recorder
+    vad = webrtcvad.Vad(aggressiveness)
+    frame = int(sr * frame_ms / 1000)
+    x = as_float32(audio)
+    pcm = np.clip(np.round(x * PCM16_SCALE), -32768, 32767).astype(np.int16).tobytes()
+    n = len(x) // frame
+    step = 2 * frame
+    return np.fromiter((vad.is_speech(pcm[i * step:(i + 1) * step], sr) for i in range(n)),
+                       dtype=bool, count=n)
+
+
+def speech_span(flags, frame_size):
+    """(start, end) samples from the first speech frame to the end of the last; (0, 0) if none."""
+    idx = np.flatnonzero(flags)
+    if idx.size == 0:
+        return 0, 0
+    return int(idx[0]) * frame_size, (int(idx[-1]) + 1) * frame_size
+
+
+def trim_bounds(span, n_samples, padding):
+    """`span` widened by `padding` samples on each side, within [0, n_samples]; (0, 0) if empty."""
+    start, end = span
+    if end <= start:
+        return 0, 0
+    return max(0, start - padding), min(n_samples, end + padding)
+
+
+def split_at_silence(flags, n_samples, frame_size, max_chunk, min_chunk, overlap):
+    """
+    (start, end, overlapped) sample spans of at most `max_chunk` samples covering n_samples.
+    Each cut goes in the middle of the longest non-speech run found between `min_chunk` and
+    `max_chunk` after the chunk start (the latest one on ties). Without any, the chunk is
+    cut at `max_chunk` and the next one starts `overlap` samples earlier (overlapped=True).
+    """
+    spans, start, overlapped = [], 0, False
+    while n_samples - start > max_chunk:
+        lo = (start + min_chunk) // frame_size
+        hi = min(len(flags), (start + max_chunk) // frame_size)
+        best, run_start = None, None
+        for f in range(lo, hi + 1):
+            silent = f < hi and not flags[f]
+            if silent and run_start is None:
+                run_start = f
+            elif not silent and run_start is not None:
+                if best is None or f - run_start >= best[1] - best[0]:
+                    best = (run_start, f)
+                run_start = None
+        if best is not None:
+            cut = (best[0] + best[1]) // 2 * frame_size
+            spans.append((start, cut, overlapped))
+            start, overlapped = cut, False
+        else:
+            cut = start + max_chunk
+            spans.append((start, cut, overlapped))
+            start, overlapped = cut - overlap, True
+    spans.append((start, n_samples, overlapped))
+    return spans
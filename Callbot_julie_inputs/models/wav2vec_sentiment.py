@@ -1,23 +1,110 @@
 import torch
 from transformers import Wav2Vec2Processor, Wav2Vec2ForSequenceClassification
 
+from .backends import check_backend, model_device, quantize_int8, load_onnx
+from .pcm import as_float32
+
 class Wav2VecSentiment:
-    def __init__(self, model_id="Lajavaness/wav2vec2-lg-xlsr-fr-speech-emotion-recognition"):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+    """
+    Speech emotion over sliding windows: `window_s` windows overlapping by `overlap_s`, run
+    `batch_windows` at a time (memory stays bounded whatever the utterance length), softmax
+    per window, mean-pooled into one label. Results never carry the raw audio:
+    {"audio_sentiment": class id, "label", "score", "probs": {label: p}}
+    plus "windows": [{"start_s", "end_s", "probs": [...]}] with return_windows=True (kept
+    off by default: the dict goes downstream as emotion_wav2vec, into the LLM prompt).
+    """
+
+    def __init__(self, model_id="Lajavaness/wav2vec2-lg-xlsr-fr-speech-emotion-recognition",
+                 backend="torch", onnx_cache_dir=None,
+                 window_s=4.0, overlap_s=1.0, batch_windows=4, min_s=0.1, return_windows=False):
+        # backend: "torch" (fp32), "int8" (dynamic quantization) or "onnx" (ONNX Runtime), see backends.py
+        check_backend(backend)
+        if not 0 <= overlap_s < window_s:
+            raise ValueError("overlap_s must be >= 0 and smaller than window_s.")
+        self.backend = backend
+        self.device = model_device(backend)
+        self.window_s = window_s
+        self.overlap_s = overlap_s
+        self.batch_windows = max(1, int(batch_windows))
+        self.min_s = min_s
+        self.return_windows = return_windows
         self.processor = Wav2Vec2Processor.from_pretrained(model_id)
-        self.model = Wav2Vec2ForSequenceClassification.from_pretrained(model_id)
-        self.model.to(self.device)
+        if backend == "onnx":
+            self.model = load_onnx("ORTModelForAudioClassification", model_id, onnx_cache_dir)
+        else:
+            self.model = Wav2Vec2ForSequenceClassification.from_pretrained(model_id)
+            if backend == "int8":
+                self.model = quantize_int8(self.model)
+            self.model.to(self.device)
+        self.id2label = {int(k): v for k, v in self.model.config.id2label.items()}
+
+    def windows(self, n, sr=16000):
+        """(start, end) sample ranges covering n samples; the last window is aligned to the end."""
+        win = int(self.window_s * sr)
+        hop = win - int(self.overlap_s * sr)
+        if n <= win:
+            return [(0, n)]
+        starts = list(range(0, n - win + 1, hop))
+        if starts[-1] + win < n:
+            starts.append(n - win)
+        return [(a, a + win) for a in starts]
+
+    def _window_probs(self, chunks, sr):
+        """Softmax probabilities for each chunk, `batch_windows` chunks per forward."""
+        out = []
+        for i in range(0, len(chunks), self.batch_windows):
+            inputs = self.processor(
+                chunks[i:i + self.batch_windows],
+                sampling_rate=sr,
+                return_tensors="pt",
+                padding=True,
+                return_attention_mask=True
+            ).to(self.device)
+
+            with torch.no_grad():
+                logits = self.model(**inputs).logits
+
+            out.extend(torch.softmax(logits, dim=-1).cpu().tolist())
+        return out
+
+    def _pool(self, spans, probs, sr):
+        # Mean over windows, weighted by window length (only the single short window differs).
+        weights = [b - a for a, b in spans]
+        total = float(sum(weights)) or 1.0
+        pooled = [sum(w * p[k] for w, p in zip(weights, probs)) / total for k in range(len(probs[0]))]
+        best = max(range(len(pooled)), key=pooled.__getitem__)
+        result = {
+            "audio_sentiment": best,
+            "label": self.id2label.get(best, str(best)),
+            "score": round(pooled[best], 4),
+            "probs": {self.id2label.get(k, str(k)): round(p, 4) for k, p in enumerate(pooled)},
+        }
+        if self.return_windows:
+            result["windows"] = [{"start_s": round(a / sr, 2), "end_s": round(b / sr, 2),
+                                  "probs": [round(x, 4) for x in p]} for (a, b), p in zip(spans, probs)]
+        return result
 
     def analyze(self, audio, sr=16000):
-        inputs = self.processor(
-            audio,
-            sampling_rate=sr,
-            return_tensors="pt",
-            padding=True
-        ).to(self.device)
-
-        with torch.no_grad():
-            logits = self.model(**inputs).logits
-
-        predicted = torch.argmax(logits, dim=-1).item()
-        return {"audio_sentiment": predicted,"audio_signal": audio }
+        return self.analyze_batch([audio], sr=sr)[0]
+
+    def analyze_batch(self, audios, sr=16000):
+        """
+        Windows of all utterances go through the model together, then are pooled per utterance.
+        Audio shorter than `min_s` (e.g. a turn trimmed to nothing) skips the model:
+        {"audio_sentiment": None, "label": None, "score": 0.0, "probs": {}} (+ "windows": []).
+        """
+        audios = [as_float32(a) for a in audios]
+        spans = [self.windows(len(a), sr) if len(a) >= self.min_s * sr else [] for a in audios]
+        chunks = [a[s:e] for a, sp in zip(audios, spans) for s, e in sp]  # views, no copies
+        probs = self._window_probs(chunks, sr)
+        results, i = [], 0
+        for sp in spans:
+            if not sp:
+                empty = {"audio_sentiment": None, "label": None, "score": 0.0, "probs": {}}
+                if self.return_windows:
+                    empty["windows"] = []
+                results.append(empty)
+                continue
+            results.append(self._pool(sp, probs[i:i + len(sp)], sr))
+            i += len(sp)
+        return results
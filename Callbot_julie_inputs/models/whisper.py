@@ -1,21 +1,147 @@
+import math
+import re
+import time
+
 import torch
 from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor
 
+from .backends import check_backend, model_device, quantize_int8, load_onnx
+from .pcm import as_float32
+from .vad import speech_flags, split_at_silence
+
+_WORD = re.compile(r"[^\w']+")
+
+# generate() settings. "default" leaves everything to the model (language detection, beam
+# count and length from its generation config). "fr_fast" forces French transcription,
+# decodes greedily and caps new tokens at `tokens_per_s` per second of audio + `min_tokens`.
+PROFILES = {
+    "default": {},
+    "fr_fast": {"language": "fr", "num_beams": 1, "tokens_per_s": 8.0, "min_tokens": 16},
+}
+MAX_NEW_TOKENS = 440  # Whisper's decoder holds 448 positions, including the prompt tokens
+
+
+def _stitch(texts, overlapped, max_words=12):
+    """Join chunk texts; after a hard cut, drop the words the next chunk repeats from the overlap."""
+    words = []
+    for text, ov in zip(texts, overlapped):
+        new = text.split()
+        if ov and words:
+            key = lambda w: _WORD.sub("", w.lower())
+            for k in range(min(max_words, len(words), len(new)), 0, -1):
+                if [key(w) for w in words[-k:]] == [key(w) for w in new[:k]]:
+                    new = new[k:]
+                    break
+        words.extend(new)
+    return " ".join(words)
+
+
 class Whisper:
-    def __init__(self, model_id="openai/whisper-small"):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model = AutoModelForSpeechSeq2Seq.from_pretrained(model_id)
+    """
+    Utterances longer than `max_chunk_s` (Whisper reads 30 s at most) are split at VAD pauses
+    (models/vad.py), hard-cut with `overlap_s` of overlap only where there is no pause, and
+    the chunks are decoded `batch_chunks` at a time, then stitched back together.
+    `profile` picks the generate() settings (PROFILES), e.g. "fr_fast" for French callers.
+    """
+
+    def __init__(self, model_id="openai/whisper-small", backend="torch", onnx_cache_dir=None,
+                 max_chunk_s=28.0, min_chunk_s=10.0, overlap_s=1.0, batch_chunks=8,
+                 profile="default", num_beams=None):
+        # backend: "torch" (fp32), "int8" (dynamic quantization) or "onnx" (ONNX Runtime), see backends.py
+        check_backend(backend)
+        self.set_profile(profile, num_beams)
+        if not 0 <= overlap_s < min_chunk_s < max_chunk_s <= 30.0:
+            raise ValueError("need 0 <= overlap_s < min_chunk_s < max_chunk_s <= 30.")
+        self.max_chunk_s = max_chunk_s
+        self.min_chunk_s = min_chunk_s
+        self.overlap_s = overlap_s
+        self.batch_chunks = max(1, int(batch_chunks))
+        self.backend = backend
+        self.device = model_device(backend)
         self.processor = AutoProcessor.from_pretrained(model_id)
-        self.model.to(self.device)
+        if backend == "onnx":
+            self.model = load_onnx("ORTModelForSpeechSeq2Seq", model_id, onnx_cache_dir)
+        else:
+            self.model = AutoModelForSpeechSeq2Seq.from_pretrained(model_id)
+            if backend == "int8":
+                self.model = quantize_int8(self.model)
+            self.model.to(self.device)
 
-    def transcribe(self, audio, sr=16000):
+    def set_profile(self, profile="default", num_beams=None):
+        """Decoding profile from PROFILES; num_beams (>= 1) overrides the profile's beam count."""
+        if profile not in PROFILES:
+            raise ValueError(f"unknown profile {profile!r}, expected one of {sorted(PROFILES)}.")
+        if num_beams is not None and num_beams < 1:
+            raise ValueError("num_beams must be >= 1.")
+        self.profile = profile
+        self.num_beams = num_beams
+
+    def decode_options(self, max_audio_s):
+        """generate() kwargs of the current profile for a batch whose longest chunk is max_audio_s."""
+        p = PROFILES[self.profile]
+        options = {}
+        if "language" in p:
+            options.update(language=p["language"], task="transcribe")
+        beams = self.num_beams if self.num_beams is not None else p.get("num_beams")
+        if beams is not None:
+            options["num_beams"] = beams
+        if "tokens_per_s" in p:
+            cap = p.get("min_tokens", 0) + p["tokens_per_s"] * max_audio_s
+            options["max_new_tokens"] = min(MAX_NEW_TOKENS, math.ceil(cap))
+        return options
+
+    def _generate(self, chunks, sr):
+        # Whisper expects [-1, 1] floats; the pipeline's shared float32 buffer passes through as is.
         inputs = self.processor(
-            audio,
+            chunks,
             sampling_rate=sr,
             return_tensors="pt"
         ).to(self.device)
+        options = self.decode_options(max(len(c) for c in chunks) / sr)
 
         with torch.no_grad():
-            ids = self.model.generate(**inputs)
+            ids = self.model.generate(**inputs, **options)
+
+        return self.processor.batch_decode(ids, skip_special_tokens=True)
+
+    def chunks(self, audio, sr=16000):
+        """(start, end, overlapped) sample spans; a single span unless audio exceeds max_chunk_s."""
+        n = len(audio)
+        if n <= int(self.max_chunk_s * sr):
+            return [(0, n, False)]
+        frame = int(sr * 0.03)
+        return split_at_silence(speech_flags(audio, sr), n, frame, int(self.max_chunk_s * sr),
+                                int(self.min_chunk_s * sr), int(self.overlap_s * sr))
+
+    def transcribe(self, audio, sr=16000):
+        return self.transcribe_long_batch([audio], sr=sr)[0]["text"]
+
+    def transcribe_batch(self, audios, sr=16000):
+        """Transcribe several utterances; their chunks share generate calls."""
+        return [r["text"] for r in self.transcribe_long_batch(audios, sr=sr)]
+
+    def transcribe_long(self, audio, sr=16000):
+        return self.transcribe_long_batch([audio], sr=sr)[0]
+
+    def transcribe_long_batch(self, audios, sr=16000):
+        """
+        One {"text", "chunks": [{"start_s", "end_s", "overlapped", "text", "batch_ms"}]} per
+        utterance. batch_ms is the wall time of the generate call that decoded the chunk.
+        Empty audio gives an empty text without calling the model.
+        """
+        audios = [as_float32(a) for a in audios]
+        jobs = [(i, s, e, ov) for i, a in enumerate(audios) for s, e, ov in self.chunks(a, sr) if e > s]
+        texts, times = [], []
+        for b in range(0, len(jobs), self.batch_chunks):
+            group = jobs[b:b + self.batch_chunks]
+            t0 = time.perf_counter()
+            texts.extend(self._generate([audios[i][s:e] for i, s, e, _ in group], sr))
+            times.extend([round(1000.0 * (time.perf_counter() - t0), 2)] * len(group))
 
-        return self.processor.batch_decode(ids, skip_special_tokens=True)[0]
+        results = [{"text": "", "chunks": []} for _ in audios]
+        for (i, s, e, ov), text, ms in zip(jobs, texts, times):
+            results[i]["chunks"].append({"start_s": round(s / sr, 2), "end_s": round(e / sr, 2),
+                                         "overlapped": ov, "text": text.strip(), "batch_ms": ms})
+        for r in results:
+            r["text"] = _stitch([c["text"] for c in r["chunks"]], [c["overlapped"] for c in r["chunks"]])
+        return results
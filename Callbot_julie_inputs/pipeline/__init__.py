@@ -1 +1,12 @@
-from .parallel_pipeline import ParallelPipeline
\ No newline at end of file
+# Exports are resolved lazily: the top-level pipeline package imports pipeline.stages
+# (standard library only) without loading the inputs models.
+
+
+def __getattr__(name):
+    if name == "ParallelPipeline":
+        from .parallel_pipeline import ParallelPipeline
+        return ParallelPipeline
+    if name == "StreamingTranscriber":
+        from .streaming_asr import StreamingTranscriber
+        return StreamingTranscriber
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,149 @@
+# Cross-call micro-batching for the inputs models.
+# Concurrent calls submit one utterance (or transcript) each; a worker thread collects up
+# to `max_batch` of them (waiting at most `max_wait_ms` after the first one), runs a single
+# padded batch on CPU and hands each caller its own result.
+
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn, max_batch: int = 8, max_wait_ms: float = 10.0, name: str = "batcher"):
+        """batch_fn(items) -> list of results, same length and order as items."""
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1.")
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._closed = False
+        self.stats = {"batches": 0, "items": 0, "max_batch_seen": 0, "batch_ms": 0.0}
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed.")
+        fut = Future()
+        self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item):
+        return self.submit(item).result()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_s
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(nxt)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            t0 = time.perf_counter()
+            try:
+                results = self.batch_fn([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} items.")
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+            else:
+                for (_, fut), result in zip(batch, results):
+                    fut.set_result(result)
+            self.stats["batches"] += 1
+            self.stats["items"] += len(batch)
+            self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(batch))
+            self.stats["batch_ms"] += 1000.0 * (time.perf_counter() - t0)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+def _by_sample_rate(run):
+    """batch_fn over (audio, sr) items: one run(audios, sr) per distinct sample rate."""
+    def batch_fn(items):
+        results = [None] * len(items)
+        groups = {}
+        for i, (_, sr) in enumerate(items):
+            groups.setdefault(sr, []).append(i)
+        for sr, idx in groups.items():
+            for i, out in zip(idx, run([items[i][0] for i in idx], sr)):
+                results[i] = out
+        return results
+    return batch_fn
+
+
+class BatchedWhisper:
+    """Drop-in for Whisper.transcribe that batches concurrent calls (Whisper.transcribe_batch)."""
+
+    def __init__(self, whisper, max_batch: int = 8, max_wait_ms: float = 10.0):
+        self.whisper = whisper
+        self.batcher = MicroBatcher(_by_sample_rate(lambda audios, sr: whisper.transcribe_batch(audios, sr=sr)),
+                                    max_batch, max_wait_ms, name="whisper-batcher")
+
+    def transcribe(self, audio, sr=16000):
+        return self.batcher((audio, sr))
+
+    def transcribe_batch(self, audios, sr=16000):
+        return self.whisper.transcribe_batch(audios, sr=sr)
+
+    def close(self):
+        self.batcher.close()
+
+
+class BatchedWav2Vec:
+    """Drop-in for Wav2VecSentiment.analyze that batches concurrent calls (analyze_batch)."""
+
+    def __init__(self, wav2vec, max_batch: int = 8, max_wait_ms: float = 10.0):
+        self.wav2vec = wav2vec
+        self.batcher = MicroBatcher(_by_sample_rate(lambda audios, sr: wav2vec.analyze_batch(audios, sr=sr)),
+                                    max_batch, max_wait_ms, name="wav2vec-batcher")
+
+    def analyze(self, audio, sr=16000):
+        return self.batcher((audio, sr))
+
+    def analyze_batch(self, audios, sr=16000):
+        return self.wav2vec.analyze_batch(audios, sr=sr)
+
+    def close(self):
+        self.batcher.close()
+
+
+class BatchedBert:
+    """Drop-in for BertSentiment.analyze that batches concurrent calls (analyze_batch)."""
+
+    def __init__(self, bert, max_batch: int = 8, max_wait_ms: float = 10.0):
+        self.bert = bert
+        self.batcher = MicroBatcher(bert.analyze_batch, max_batch, max_wait_ms, name="bert-batcher")
+
+    def analyze(self, text):
+        return self.batcher(text)
+
+    def analyze_batch(self, texts):
+        return self.bert.analyze_batch(texts)
+
+    def close(self):
+        self.batcher.close()
@@ -1,26 +1,85 @@
 import threading
 from models.audio_summary import compute_audio_summary
+from models.pcm import as_float32
+from models.vad import speech_flags, speech_span, trim_bounds
+from .stages import PipelineStageError, StageExecutors, set_torch_threads
+
+STAGES = ("text", "wav2vec", "audio_summary")
+
 
 class ParallelPipeline:
-    def __init__(self, whisper, bert, wav2vec, sample_rate_hz: int = 16000):
+    """
+    Runs the text (Whisper -> BERT), wav2vec and audio_summary stages of one utterance in
+    parallel on long-lived executors (stages.StageExecutors: one per stage, `concurrency`
+    workers each, so that many calls can be in flight, e.g. with the batched models of
+    pipeline/batching.py).
+    - torch_threads: torch's intra-op thread count, set once for the whole process
+      (default: stages.default_torch_threads(), the cores split between the two torch stages).
+    - timeouts_s: per-stage timeout; a late stage is left out and listed in
+      results["pipeline_stats"]["timeouts"] (it keeps running on its worker, and the stage
+      gets a fresh executor so later calls do not wait behind it).
+    - stage exceptions are raised as PipelineStageError (with the partial results) unless
+      raise_errors=False, then they are listed in results["pipeline_stats"]["errors"].
+    results["pipeline_stats"]["stages"] has wall_ms and cpu_ms (stage thread CPU) per stage.
+    - trim_padding_s: Whisper and wav2vec only get the speech, from the first to the last VAD
+      speech frame plus this padding (None = no trimming); audio_summary gets the whole
+      utterance. results["pipeline_stats"]["trim"] reports the audio left out.
+    """
+
+    def __init__(self, whisper, bert, wav2vec, sample_rate_hz: int = 16000,
+                 torch_threads=None, timeouts_s=None, raise_errors: bool = True,
+                 concurrency: int = 4, trim_padding_s=0.2):
         self.whisper = whisper
         self.bert = bert
         self.wav2vec = wav2vec
         self.sr = sample_rate_hz
+        self.torch_threads = set_torch_threads(torch_threads)
+        self.timeouts_s = dict(timeouts_s or {})
+        self.raise_errors = raise_errors
+        self.trim_padding_s = trim_padding_s
+        self._stages = StageExecutors(STAGES, concurrency)
 
-    def process(self, audio):
+    def _trim(self, audio, span):
+        """View of the speech part of audio for the model stages, and the trim stats."""
+        if self.trim_padding_s is None:
+            return audio, None
+        if span is None:
+            frame = int(self.sr * 0.03)
+            span = speech_span(speech_flags(audio, self.sr), frame)
+        start, end = trim_bounds(span, len(audio), int(self.trim_padding_s * self.sr))
+        audio_ms = 1000.0 * len(audio) / self.sr
+        kept_ms = 1000.0 * (end - start) / self.sr
+        return audio[start:end], {
+            "audio_ms": round(audio_ms, 1),
+            "kept_ms": round(kept_ms, 1),
+            "trimmed_ms": round(audio_ms - kept_ms, 1),
+            "saved_ratio": round(1.0 - kept_ms / audio_ms, 3) if audio_ms else 0.0,
+        }
+
+    def process(self, audio, transcriber=None, audio_summary=None, speech_span=None):
+        # transcriber: a StreamingTranscriber already fed during capture; its text is used
+        # instead of transcribing the whole utterance again.
+        # audio_summary: already computed during capture (AudioRecorder.last_summary).
+        # speech_span: (start, end) speech samples from capture (AudioRecorder.last_speech_span);
+        # without it, the VAD is run here to find them.
+        # One read-only float32 copy of the utterance, shared by every stage.
+        audio = as_float32(audio)
+        speech, trim = self._trim(audio, speech_span)
         results = {}
         lock = threading.Lock()
 
         def text_path():
-            text = self.whisper.transcribe(audio)
+            if transcriber is not None:
+                text = transcriber.result()
+            else:
+                text = self.whisper.transcribe(speech) if len(speech) else ""
             bert_out = self.bert.analyze(text)
             with lock:
                 results["full_text"] = text
                 results["emotion_bert"] = bert_out
 
         def wav2vec_path():
-            wav2vec_out = self.wav2vec.analyze(audio)
+            wav2vec_out = self.wav2vec.analyze(speech)
             with lock:
                 results["emotion_wav2vec"] = wav2vec_out
 
@@ -29,11 +88,27 @@ class ParallelPipeline:
             with lock:
                 results["audio_summary"] = summary
 
-        t1 = threading.Thread(target=text_path)
-        t2 = threading.Thread(target=wav2vec_path)
-        t3 = threading.Thread(target=audio_summary_path)
+        paths = {"text": text_path, "wav2vec": wav2vec_path}
+        if audio_summary is not None:
+            results["audio_summary"] = audio_summary
+        else:
+            paths["audio_summary"] = audio_summary_path
+
+        stats, errors = self._stages.run(paths, self.timeouts_s)
+        with lock:
+            out = dict(results)
+        out["pipeline_stats"] = stats
+        if trim is not None:
+            out["pipeline_stats"]["trim"] = trim
+        if errors and self.raise_errors:
+            raise PipelineStageError(errors, out)
+        return out
+
+    def close(self):
+        self._stages.close()
 
-        t1.start(); t2.start(); t3.start()
-        t1.join();  t2.join();  t3.join()
+    def __enter__(self):
+        return self
 
-        return results
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,108 @@
+# Pieces shared by both ParallelPipeline implementations (this package and the top-level
+# pipeline/ package). Standard library only, so the top-level package can import it
+# without pulling in the inputs models.
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import os
+import threading
+import time
+
+# Stages that run torch models at the same time: Whisper -> BERT and wav2vec.
+TORCH_STAGES = 2
+
+
+def default_torch_threads(cpus=None):
+    """Intra-op threads per torch op so the concurrent torch stages share the cores."""
+    cpus = cpus or os.cpu_count() or 1
+    return max(1, cpus // TORCH_STAGES)
+
+
+def set_torch_threads(n=None):
+    """
+    Set torch's intra-op thread count (default: default_torch_threads()). The setting is
+    process-wide, not per thread, so it is set once here rather than by each stage worker;
+    how many ops run at once is bounded by the stage executors' sizes.
+    Returns the count set, or None without torch.
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    n = n or default_torch_threads()
+    torch.set_num_threads(n)
+    return n
+
+
+class PipelineStageError(RuntimeError):
+    def __init__(self, errors, partial):
+        self.errors = errors      # stage -> exception
+        self.partial = partial    # results of the stages that did finish
+        super().__init__("; ".join(f"{s}: {e!r}" for s, e in errors.items()))
+
+
+class StageExecutors:
+    """
+    One long-lived executor per stage, `workers` threads each. run() submits one call's
+    stage functions, waits for them within their timeouts and reports per-stage
+    wall_ms/cpu_ms, timeouts and errors. A timed-out call keeps running on its worker, so
+    that stage gets a fresh executor: later calls do not queue behind it (the old one
+    finishes its running and queued work, then its threads exit).
+    """
+
+    def __init__(self, stages, workers=1):
+        self.workers = max(1, int(workers))
+        self._lock = threading.Lock()
+        self._executors = {stage: self._new(stage) for stage in stages}
+        self.replaced = {stage: 0 for stage in stages}
+
+    def _new(self, stage):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"pipeline-{stage}")
+
+    def run(self, paths, timeouts_s=None):
+        """paths: stage -> fn(). Returns (pipeline_stats, {stage: exception})."""
+        timeouts_s = timeouts_s or {}
+        timings = {}
+
+        def timed(stage, fn):
+            def run():
+                t0, c0 = time.perf_counter(), time.thread_time()
+                try:
+                    fn()
+                finally:
+                    timings[stage] = {"wall_ms": round(1000.0 * (time.perf_counter() - t0), 2),
+                                      "cpu_ms": round(1000.0 * (time.thread_time() - c0), 2)}
+            return run
+
+        start = time.perf_counter()
+        with self._lock:
+            futures = {stage: self._executors[stage].submit(timed(stage, fn)) for stage, fn in paths.items()}
+        timeouts, errors = [], {}
+        for stage, fut in futures.items():
+            limit = timeouts_s.get(stage)
+            remaining = None if limit is None else max(0.0, limit - (time.perf_counter() - start))
+            try:
+                fut.result(timeout=remaining)
+            except FutureTimeout:
+                timeouts.append(stage)
+                self._replace(stage)
+            except Exception as e:
+                errors[stage] = e
+
+        stats = {
+            "wall_ms": round(1000.0 * (time.perf_counter() - start), 2),
+            "stages": {stage: timings.get(stage) for stage in futures},
+            "timeouts": timeouts,
+            "errors": {stage: repr(e) for stage, e in errors.items()},
+        }
+        return stats, errors
+
+    def _replace(self, stage):
+        with self._lock:
+            old, self._executors[stage] = self._executors[stage], self._new(stage)
+            self.replaced[stage] += 1
+        old.shutdown(wait=False)
+
+    def close(self):
+        with self._lock:
+            for ex in self._executors.values():
+                ex.shutdown(wait=False)
@@ -0,0 +1,57 @@
+# Incremental Whisper transcription during capture.
+# The recorder hands over VAD-delimited segments while the caller is still speaking;
+# they are transcribed in order on one background thread, so at end-of-turn only the
+# last segment is left to decode.
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import numpy as np
+
+
+class StreamingTranscriber:
+    def __init__(self, whisper, sr: int = 16000, on_partial=None):
+        """on_partial(segment_index, segment_text, text_so_far) is called as each segment is done."""
+        self.whisper = whisper
+        self.sr = sr
+        self.on_partial = on_partial
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr-stream")
+        self._lock = threading.Lock()
+        self._futures = []
+        self._texts = []
+        self._final = None
+        self.stats = {"segments": 0, "asr_ms": 0.0, "final_segment_ms": 0.0, "end_of_turn_wait_ms": 0.0}
+
+    def _transcribe(self, index: int, segment: np.ndarray) -> str:
+        t0 = time.perf_counter()
+        text = self.whisper.transcribe(segment, sr=self.sr).strip() if segment.size else ""
+        ms = 1000.0 * (time.perf_counter() - t0)
+        with self._lock:
+            self._texts.append(text)
+            so_far = " ".join(t for t in self._texts if t)
+            self.stats["segments"] += 1
+            self.stats["asr_ms"] += ms
+            self.stats["final_segment_ms"] = ms
+        if self.on_partial is not None and text:
+            self.on_partial(index, text, so_far)
+        return text
+
+    def feed(self, segment: np.ndarray, final: bool = False) -> None:
+        """Queue one segment (recorder on_segment hook). Segments are decoded in arrival order."""
+        index = len(self._futures)
+        self._futures.append(self._executor.submit(self._transcribe, index, segment))
+        if final:
+            self._final = time.perf_counter()
+
+    def result(self) -> str:
+        """Block until every queued segment is transcribed and return the full text."""
+        for fut in self._futures:
+            fut.result()
+        if self._final is not None:
+            self.stats["end_of_turn_wait_ms"] = 1000.0 * (time.perf_counter() - self._final)
+        with self._lock:
+            return " ".join(t for t in self._texts if t)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
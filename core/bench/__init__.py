@@ -0,0 +1,2 @@
+# Offline benchmarks for the AI Core (no network, no model required).
+# Run a module directly, e.g. `python -m core.bench.rules_bench`.
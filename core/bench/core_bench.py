@@ -0,0 +1,130 @@
+# Offline latency/accuracy benchmark of the core decision graph.
+# No network, no model: LLM modes talk to core.bench.fake_ollama.
+#
+#   python -m core.bench.core_bench [--repeat 3] [--concurrency 4] [--malformed 0.1]
+#                                   [--timeout-rate 0.05] [--modes rules,llm,llm_stream,cached,speculative]
+#
+# Reports throughput, latency p50/p95/p99, fallback rate, error count and
+# intent/urgency accuracy against core/bench/fixtures.py. With both llm (waits for the
+# whole generation) and llm_stream (hangs up at the first complete decision), it also
+# prints the measured early-stop saving: the p50/p95 latency difference between them.
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core.bench.fake_ollama import FakeOllama, FakeOllamaConfig
+from core.bench.fixtures import FIXTURES, INTENT_ALIASES, check_coverage
+from core.cache import DecisionCache
+from core.graph import build_app
+from core.llm_ollama import OllamaDecisionLLM
+from core.metrics import percentile
+from core.state import CoreState
+
+MODES = ("rules", "llm", "llm_stream", "cached", "speculative")
+
+
+def make_app(mode: str, url: str, client_timeout_s: float, deadline_s: float):
+    if mode == "rules":
+        return build_app(use_llm=False)
+    llm = OllamaDecisionLLM(model="fake", base_url=url, timeout_s=client_timeout_s, warmup=False,
+                            stream=mode != "llm")
+    if mode in ("llm", "llm_stream"):
+        return build_app(llm=llm)
+    if mode == "cached":
+        return build_app(llm=llm, cache=DecisionCache())
+    if mode == "speculative":
+        return build_app(llm=llm, decide_mode="speculative", llm_deadline_s=deadline_s)
+    raise ValueError(f"mode must be one of {MODES}.")
+
+
+def _one(app, fixture: Dict[str, str]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    try:
+        out = app.invoke(CoreState(fixture["text"], {}, {}, {}))
+        error = None
+    except Exception as e:  # unparseable after repair, etc.
+        out, error = {"decision": None, "debug": {}}, repr(e)
+    return {"ms": 1000.0 * (time.perf_counter() - t0), "fixture": fixture,
+            "decision": out["decision"], "mode": out["debug"].get("mode"), "error": error}
+
+
+def run_mode(app, repeat: int, concurrency: int) -> Dict[str, Any]:
+    work = [f for _ in range(repeat) for f in FIXTURES]
+    t0 = time.perf_counter()
+    if concurrency <= 1:
+        results = [_one(app, f) for f in work]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as ex:
+            results = list(ex.map(lambda f: _one(app, f), work))
+    wall = time.perf_counter() - t0
+
+    ok = [r for r in results if r["decision"] is not None]
+    lat = sorted(r["ms"] for r in results)
+    intent_hits = sum(1 for r in ok
+                      if INTENT_ALIASES.get(r["decision"]["intent"], r["decision"]["intent"]) == r["fixture"]["intent"])
+    urgency_hits = sum(1 for r in ok if r["decision"]["urgency"] == r["fixture"]["urgency"])
+    n = len(results)
+    return {
+        "n": n,
+        "throughput": n / wall if wall > 0 else 0.0,
+        "p50": percentile(lat, 0.50),
+        "p95": percentile(lat, 0.95),
+        "p99": percentile(lat, 0.99),
+        "fallback": sum(1 for r in results if r["mode"] == "rules_fallback") / n,
+        "errors": n - len(ok),
+        "intent_acc": intent_hits / n,
+        "urgency_acc": urgency_hits / n,
+    }
+
+
+def run(modes: List[str], repeat: int, concurrency: int, config: FakeOllamaConfig,
+        client_timeout_s: float, deadline_s: float) -> Dict[str, Dict[str, Any]]:
+    check_coverage()
+    reports = {}
+    with FakeOllama(config) as fake:
+        for mode in modes:
+            app = make_app(mode, fake.url, client_timeout_s, deadline_s)
+            reports[mode] = run_mode(app, repeat, concurrency)
+    return reports
+
+
+def print_report(reports: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'mode':<12} {'n':>5} {'dec/s':>8} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} "
+          f"{'fallback':>8} {'errors':>6} {'intent':>7} {'urgency':>7}")
+    for mode, r in reports.items():
+        print(f"{mode:<12} {r['n']:>5} {r['throughput']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} "
+              f"{r['p99']:>8.1f} {r['fallback']:>8.1%} {r['errors']:>6} {r['intent_acc']:>7.1%} "
+              f"{r['urgency_acc']:>7.1%}")
+    if "llm" in reports and "llm_stream" in reports:
+        full, early = reports["llm"], reports["llm_stream"]
+        print(f"early stop saving (llm - llm_stream): p50 {full['p50'] - early['p50']:.1f} ms, "
+              f"p95 {full['p95'] - early['p95']:.1f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Offline benchmark of the core decision graph.")
+    ap.add_argument("--modes", default=",".join(MODES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--latency", type=float, default=0.05, help="fake time to first token (s)")
+    ap.add_argument("--token-latency", type=float, default=0.002, help="fake per-token time (s)")
+    ap.add_argument("--accuracy", type=float, default=0.9, help="fake model oracle accuracy")
+    ap.add_argument("--malformed", type=float, default=0.1, help="rate of malformed outputs")
+    ap.add_argument("--timeout-rate", type=float, default=0.05, help="rate of hung requests")
+    ap.add_argument("--client-timeout", type=float, default=1.0)
+    ap.add_argument("--deadline", type=float, default=0.3, help="speculative mode LLM deadline (s)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    config = FakeOllamaConfig(base_latency_s=args.latency, token_latency_s=args.token_latency,
+                              accuracy=args.accuracy, malformed_rate=args.malformed,
+                              timeout_rate=args.timeout_rate, hang_s=args.client_timeout * 2,
+                              seed=args.seed)
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    print_report(run(modes, args.repeat, args.concurrency, config, args.client_timeout, args.deadline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Local stand-in for Ollama's /api/generate, for offline benchmarks.
+# It answers from the labelled fixtures (an "oracle" model with configurable accuracy)
+# and can inject latency, malformed outputs and hangs (client timeouts).
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+import json
+import random
+import re
+import threading
+import time
+
+from core.bench.fixtures import FIXTURES
+from core.static import INTENTS
+
+_TEXT = re.compile(r'"""(.*?)"""', re.S)
+
+
+@dataclass
+class FakeOllamaConfig:
+    base_latency_s: float = 0.05      # prompt eval / time to first token
+    token_latency_s: float = 0.002    # per streamed token
+    accuracy: float = 0.9             # P(oracle label) else random intent/urgency
+    malformed_rate: float = 0.0       # P(answer is near-miss / broken JSON)
+    timeout_rate: float = 0.0         # P(request hangs for hang_s)
+    hang_s: float = 30.0
+    pad_tokens: bool = True           # keep emitting whitespace up to num_predict (JSON-mode habit)
+    seed: int = 0
+
+
+# Near-miss shapes; the first ones are fixable locally, the last needs the LLM repair call.
+_MALFORMED = (
+    lambda d: "Voici la décision : " + json.dumps(d, ensure_ascii=False) + " Merci.",
+    lambda d: json.dumps(d, ensure_ascii=False).replace('"', "'"),
+    lambda d: json.dumps({**d, "urgency": {"med": "medium"}.get(d["urgency"], d["urgency"])}, ensure_ascii=False),
+    lambda d: json.dumps({**d, "confidence": f"{int(d['confidence'] * 100)}%"}, ensure_ascii=False),
+    lambda d: json.dumps(d, ensure_ascii=False)[:-1],
+    lambda d: "Je pense que c'est " + d["intent"],
+)
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up mid-stream is expected (early stop / cancel)
+
+
+class FakeOllama:
+    def __init__(self, config: Optional[FakeOllamaConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeOllamaConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._labels: Dict[str, Dict[str, str]] = {f["text"].strip(): f for f in FIXTURES}
+        self.requests = 0
+        self.aborted = 0
+        self._server = _QuietServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _choice(self, seq):
+        with self._rng_lock:
+            return self._rng.choice(seq)
+
+    def answer(self, prompt: str) -> str:
+        """Model output for one prompt (oracle label, possibly wrong or malformed)."""
+        if "SORTIE À CORRIGER" in prompt:
+            m = re.search(r"c'est (\w+)", prompt)
+            intent = m.group(1) if m and m.group(1) in INTENTS else "inconnu"
+            return json.dumps({"intent": intent, "urgency": "low", "action": "escalate", "confidence": 0.5})
+
+        m = _TEXT.search(prompt)
+        label = self._labels.get(m.group(1).strip()) if m else None
+        if label is not None and self._draw() < self.config.accuracy:
+            intent, urgency = label["intent"], label["urgency"]
+        else:
+            intent, urgency = self._choice(INTENTS), self._choice(("low", "med", "high"))
+        action = "escalate" if urgency == "high" or intent in ("reclamation", "transfert_humain", "inconnu") else "rag_query"
+        decision = {"intent": intent, "urgency": urgency, "action": action, "confidence": 0.82}
+
+        if self._draw() < self.config.malformed_rate:
+            return self._choice(_MALFORMED)(decision)
+        return json.dumps(decision, ensure_ascii=False)
+
+    def _handler(self):
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                fake.requests += 1
+                cfg = fake.config
+                if not body.get("prompt"):
+                    return self._send_json({"response": "", "done": True})  # warm-up / load
+
+                if fake._draw() < cfg.timeout_rate:
+                    time.sleep(cfg.hang_s)
+                time.sleep(cfg.base_latency_s)
+                text = fake.answer(body["prompt"])
+                num_predict = int(body.get("options", {}).get("num_predict", 120))
+
+                if not body.get("stream", True):
+                    time.sleep(cfg.token_latency_s * (num_predict if cfg.pad_tokens else len(text) // 3))
+                    return self._send_json({"response": text, "done": True})
+                self._stream(text, num_predict)
+
+            def _send_json(self, obj) -> None:
+                data = json.dumps(obj).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, text: str, num_predict: int) -> None:
+                pieces = [text[i:i + 3] for i in range(0, len(text), 3)]  # ~3 chars per token
+                if fake.config.pad_tokens:
+                    pieces += ["\n"] * max(0, num_predict - len(pieces))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for p in pieces[:num_predict]:
+                        self._chunk({"response": p, "done": False})
+                        time.sleep(fake.config.token_latency_s)
+                    self._chunk({"response": "", "done": True})
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    fake.aborted += 1  # client hung up (early stop / cancel)
+
+            def _chunk(self, obj) -> None:
+                data = (json.dumps(obj) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return _Handler
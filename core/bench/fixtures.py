@@ -0,0 +1,65 @@
+# Labelled French caller utterances for offline benchmarks.
+# Every intent in INTENTS and every urgency level is covered.
+# Labels are what a human router would pick, not what the rules currently output.
+
+from typing import Dict, List
+
+from core.static import INTENTS, ALLOWED_URGENCY
+
+FIXTURES: List[Dict[str, str]] = [
+    # declaration_sinistre
+    {"text": "Bonjour, je veux déclarer un sinistre, j'ai eu un accident de vélo hier", "intent": "declaration_sinistre", "urgency": "med"},
+    {"text": "je téléphone pour déclarer un accident, je suis tombé dans l'escalier", "intent": "declaration_sinistre", "urgency": "med"},
+    {"text": "je voudrais ouvrir dossier pour une brûlure à la main", "intent": "declaration_sinistre", "urgency": "med"},
+    {"text": "je dois signaler un problème, mon fils s'est cassé le bras, il a une fracture", "intent": "declaration_sinistre", "urgency": "high"},
+    {"text": "j'ai eu un accident de ski, je suis à l'hôpital, ils vont faire une chirurgie", "intent": "declaration_sinistre", "urgency": "high"},
+    {"text": "je viens pour sinistre, rien de grave, juste un dommage chez moi", "intent": "declaration_sinistre", "urgency": "low"},
+    # suivi_dossier
+    {"text": "où en est mon dossier s'il vous plaît", "intent": "suivi_dossier", "urgency": "low"},
+    {"text": "je voudrais connaître le statut le dossier, j'ai le numéro dossier sous les yeux", "intent": "suivi_dossier", "urgency": "low"},
+    {"text": "quel est l'état de ma demande, j'ai envoyé tout le mois dernier", "intent": "suivi_dossier", "urgency": "low"},
+    {"text": "combien de temps pour le règlement de mon dossier", "intent": "suivi_dossier", "urgency": "low"},
+    {"text": "suivi mon dossier, j'ai toujours une douleur et je n'ai pas de nouvelles", "intent": "suivi_dossier", "urgency": "med"},
+    # documents_medicaux
+    {"text": "quels documents je dois fournir pour mon dossier", "intent": "documents_medicaux", "urgency": "low"},
+    {"text": "je dois envoyer le certificat médical, à quelle adresse", "intent": "documents_medicaux", "urgency": "low"},
+    {"text": "j'ai envoyé la facture médicale et le compte rendu médical", "intent": "documents_medicaux", "urgency": "low"},
+    {"text": "mon arrêt de travail, je l'envoie où, le médecin me l'a donné après la consultation", "intent": "documents_medicaux", "urgency": "med"},
+    # indemnisation
+    {"text": "quand je vais recevoir le virement de l'indemnisation", "intent": "indemnisation", "urgency": "low"},
+    {"text": "je voudrais changer mon rib pour le paiement", "intent": "indemnisation", "urgency": "low"},
+    {"text": "combien je vais recevoir pour ma blessure", "intent": "indemnisation", "urgency": "med"},
+    {"text": "c'est pour récupérer mon argent, le règlement n'est pas arrivé", "intent": "indemnisation", "urgency": "low"},
+    # infos_contrat
+    {"text": "est-ce que ça couvre les accidents de sport dans mon contrat", "intent": "infos_contrat", "urgency": "low"},
+    {"text": "quelle garantie j'ai sur ma police d'assurance", "intent": "infos_contrat", "urgency": "low"},
+    {"text": "qui est couvert, mes enfants sont bénéficiaires", "intent": "infos_contrat", "urgency": "low"},
+    {"text": "ma couverture prend en charge une prothèse après amputation ?", "intent": "infos_contrat", "urgency": "high"},
+    # reclamation
+    {"text": "je fais une réclamation, mon dossier a été refusé sans explication", "intent": "reclamation", "urgency": "low"},
+    {"text": "ça fait longtemps et j'ai toujours pas reçu, ce n'est pas normal", "intent": "reclamation", "urgency": "low"},
+    {"text": "je vais contester la décision, je ne suis pas d'accord", "intent": "reclamation", "urgency": "low"},
+    {"text": "je suis mécontent, on m'a refusé alors que j'ai une incapacité permanente", "intent": "reclamation", "urgency": "high"},
+    # transfert_humain
+    {"text": "je veux parler à un conseiller", "intent": "transfert_humain", "urgency": "low"},
+    {"text": "passez-moi un humain s'il vous plaît", "intent": "transfert_humain", "urgency": "low"},
+    {"text": "pouvez-vous me transférer à un opérateur, c'est urgent", "intent": "transfert_humain", "urgency": "high"},
+    {"text": "j'veux parler à une personne, mon mari est en soins intensifs", "intent": "transfert_humain", "urgency": "high"},
+    # inconnu
+    {"text": "allô, oui bonjour", "intent": "inconnu", "urgency": "low"},
+    {"text": "euh attendez je cherche mes lunettes", "intent": "inconnu", "urgency": "low"},
+    {"text": "il fait beau aujourd'hui à Lyon", "intent": "inconnu", "urgency": "low"},
+    {"text": "il y a du sang partout, appelez une ambulance", "intent": "inconnu", "urgency": "high"},
+    {"text": "j'ai une plaie au genou, c'est une contusion je crois", "intent": "inconnu", "urgency": "med"},
+]
+
+# Rules output "unknown" where the catalog says "inconnu".
+INTENT_ALIASES = {"unknown": "inconnu"}
+
+
+def check_coverage() -> None:
+    intents = {f["intent"] for f in FIXTURES}
+    urgencies = {f["urgency"] for f in FIXTURES}
+    missing = (set(INTENTS) - intents) | (set(ALLOWED_URGENCY) - urgencies)
+    if missing:
+        raise AssertionError(f"fixtures do not cover: {sorted(missing)}")
@@ -0,0 +1,79 @@
+# Time-to-first-token with and without prefix KV reuse, against a LOCAL Ollama.
+# Needs `ollama serve` and the model pulled (see README).
+#
+#   python -m core.bench.prefix_bench [--model llama3.2:1b-instruct] [--n 20]
+#
+# Variants:
+#   inline        legacy decision_prompt() (instructions + fields in one prompt)
+#   prefix_cold   system prefix with a per-call nonce in front (defeats prefix reuse)
+#   prefix_warm   constant DECISION_SYSTEM_PREFIX (Ollama reuses the cached prefix)
+
+import argparse
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.bench.rules_bench import UTTERANCES
+from core.llm_ollama import OllamaDecisionLLM
+from core.metrics import percentile
+from core.prompts import DECISION_SYSTEM_PREFIX, decision_prompt, decision_prompt_suffix
+from core.static import DEFAULT_OLLAMA_MODEL
+
+SIGNALS = ({"label": "NEGATIVE", "score": 0.91}, {"audio_sentiment": 3},
+           {"silence_ratio": 0.21, "clipping_ratio": 0.0, "global_peak_zscore": 3.1})
+
+
+def _inline(text: str) -> Tuple[str, Optional[str]]:
+    return decision_prompt(text, *SIGNALS), None
+
+
+def _prefix_cold(text: str) -> Tuple[str, Optional[str]]:
+    return decision_prompt_suffix(text, *SIGNALS), f"[session {uuid.uuid4()}]\n{DECISION_SYSTEM_PREFIX}"
+
+
+def _prefix_warm(text: str) -> Tuple[str, Optional[str]]:
+    return decision_prompt_suffix(text, *SIGNALS), DECISION_SYSTEM_PREFIX
+
+
+VARIANTS: Dict[str, Callable[[str], Tuple[str, Optional[str]]]] = {
+    "inline": _inline,
+    "prefix_cold": _prefix_cold,
+    "prefix_warm": _prefix_warm,
+}
+
+
+def run(model: str, base_url: str, n: int, timeout_s: float) -> None:
+    llm = OllamaDecisionLLM(model=model, base_url=base_url, timeout_s=timeout_s, warmup=False)
+    if not llm.warmup(timeout_s=300):
+        raise SystemExit(f"Ollama not reachable at {base_url}: {llm.warmup_error}")
+
+    print(f"{'variant':<12} {'n':>3} {'ttft_p50':>9} {'ttft_p95':>9} {'total_p50':>10}")
+    for name, build in VARIANTS.items():
+        try:
+            llm.decide_json(*build(UTTERANCES[0]))  # untimed: same starting point per variant
+        except ValueError:
+            pass
+        ttft: List[float] = []
+        total: List[float] = []
+        for i in range(n):
+            prompt, system = build(UTTERANCES[i % len(UTTERANCES)])
+            try:
+                llm.decide_json(prompt, system=system)
+            except ValueError:
+                pass  # unparseable output still has a valid TTFT
+            stats = llm.last_stats
+            ttft.append(stats["ttft_ms"])
+            total.append(stats["total_ms"])
+        ttft.sort()
+        total.sort()
+        print(f"{name:<12} {n:>3} {percentile(ttft, 0.5):>9.1f} {percentile(ttft, 0.95):>9.1f} "
+              f"{percentile(total, 0.5):>10.1f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--model", default=DEFAULT_OLLAMA_MODEL)
+    ap.add_argument("--base-url", default="http://localhost:11434")
+    ap.add_argument("--n", type=int, default=20)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    args = ap.parse_args()
+    run(args.model, args.base_url, args.n, args.timeout)
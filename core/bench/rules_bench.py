@@ -0,0 +1,111 @@
+# Micro-benchmark: per-utterance cost of the keyword rules as the catalog grows.
+# Compares the legacy "one search per pattern" scoring with KeywordMatcher, and checks
+# that both return the same (urgency, intent, strength) decisions. The legacy patterns
+# are precompiled, so large catalogs do not measure re's module cache (512 entries)
+# thrashing instead of the scan itself.
+#
+#   python -m core.bench.rules_bench [--sizes 50,100,200,400,800] [--repeat 200]
+
+import argparse
+import random
+import re
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from core.rules import KeywordMatcher
+from core.static import INTENT_KEYWORDS, URG_HIGH, URG_MED
+
+UTTERANCES = [
+    "Bonjour, je veux déclarer un sinistre, j'ai eu un accident hier",
+    "où en est mon dossier s'il vous plaît, ça fait longtemps",
+    "je dois envoyer le certificat médical, quels documents faut-il ?",
+    "quand je vais recevoir le virement de l'indemnisation",
+    "est-ce que ça couvre les fractures, quelle garantie sur mon contrat",
+    "je suis à l'hôpital, c'est urgent, il y a du sang",
+    "je veux parler à un conseiller humain",
+    "j'ai une douleur au dos depuis la chute, arrêt de travail",
+    "réclamation : refusé sans raison, je vais contester",
+    "euh allô oui bonjour",
+]
+
+
+def legacy_urgency(text: str, high: Sequence["re.Pattern"], med: Sequence["re.Pattern"]) -> str:
+    t = text.lower()
+    if any(p.search(t) for p in high):
+        return "high"
+    if any(p.search(t) for p in med):
+        return "med"
+    return "low"
+
+
+def legacy_intent(text: str, intent_keywords: Dict[str, Sequence["re.Pattern"]]) -> Tuple[str, float]:
+    t = text.lower()
+    best_intent, best_hits = "unknown", 0
+    for intent, kws in intent_keywords.items():
+        hits = sum(1 for kw in kws if kw.search(t))
+        if hits > best_hits:
+            best_intent, best_hits = intent, hits
+    strength = min(1.0, best_hits / 3.0) if best_hits > 0 else 0.0
+    return best_intent, strength
+
+
+def grow_catalog(size: int, seed: int = 0):
+    """Pad the real catalog with synthetic French-like patterns up to `size` patterns."""
+    rng = random.Random(seed)
+    intents = {k: list(v) for k, v in INTENT_KEYWORDS.items()}
+    high, med = list(URG_HIGH), list(URG_MED)
+    total = sum(len(v) for v in intents.values()) + len(high) + len(med)
+    names = [k for k in intents if k != "inconnu"]
+    i = 0
+    while total < size:
+        stem = "".join(rng.choice("abcdefghilmnoprstu") for _ in range(rng.randint(4, 8)))
+        kind = i % 4
+        if kind == 0:
+            high.append(rf"\b{stem}\b")
+        elif kind == 1:
+            med.append(rf"\b{stem}[ée]?s?\b")
+        else:
+            intents[names[i % len(names)]].append(rf"\b({stem}|{stem[::-1]})\s+(mon|le|la)\s+\w+")
+        total += 1
+        i += 1
+    return intents, high, med
+
+
+def _per_utterance_us(fn, texts: List[str], repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    return 1e6 * (time.perf_counter() - t0) / (repeat * len(texts))
+
+
+def run(sizes: Sequence[int], repeat: int) -> None:
+    print(f"{'patterns':>8} {'legacy_us':>10} {'matcher_us':>11} {'speedup':>8}")
+    for size in sizes:
+        intents, high, med = grow_catalog(size)
+        matcher = KeywordMatcher(intents, high, med)
+        high_re, med_re = [re.compile(p) for p in high], [re.compile(p) for p in med]
+        intents_re = {k: [re.compile(p) for p in v] for k, v in intents.items()}
+
+        def legacy(t):
+            return legacy_urgency(t, high_re, med_re), legacy_intent(t, intents_re)
+
+        def single_pass(t):
+            scan = matcher.scan(t)
+            return matcher.urgency(scan), matcher.intent_prior(scan)
+
+        for t in UTTERANCES:
+            if legacy(t) != single_pass(t):
+                raise AssertionError(f"decision mismatch on {t!r}: {legacy(t)} != {single_pass(t)}")
+
+        legacy_us = _per_utterance_us(legacy, UTTERANCES, repeat)
+        matcher_us = _per_utterance_us(single_pass, UTTERANCES, repeat)
+        print(f"{len(matcher):>8} {legacy_us:>10.1f} {matcher_us:>11.1f} {legacy_us / matcher_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", default="50,100,200,400,800")
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.repeat)
@@ -0,0 +1,118 @@
+# Bounded LRU + TTL cache of decisions, keyed on normalized text + coarse signals.
+# Callers repeat the same openings a lot; a hit skips the decide node (no Ollama call).
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+import re
+import threading
+import time
+
+from .static import DEFAULT_DECISION_CACHE_SIZE, DEFAULT_DECISION_CACHE_TTL_S
+
+_WS = re.compile(r"\s+")
+_EDGE_PUNCT = " \t\n.,;:!?…\"'«»-"
+
+# Bucket edges follow the thresholds used by decide_rules_only.
+SILENCE_EDGES = (0.30, 0.60)
+CLIPPING_EDGES = (0.05,)
+PEAK_Z_EDGES = (2.5, 4.0)
+SCORE_EDGES = (0.5, 0.8)
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", (text or "").lower()).strip(_EDGE_PUNCT)
+
+
+def _bucket(value: Any, edges: Sequence[float]) -> int:
+    try:
+        v = float(value or 0.0)
+    except (TypeError, ValueError):
+        return -1
+    return sum(1 for e in edges if v > e)
+
+
+def _emotion_bucket(emotion: Optional[Dict[str, Any]]) -> Tuple[Any, int]:
+    # BERT pipeline: {"label", "score"}; wav2vec: {"audio_sentiment": class id}
+    if not emotion:
+        return None, -1
+    label = emotion.get("label", emotion.get("audio_sentiment"))
+    if not isinstance(label, (str, int, float, type(None))):
+        label = str(label)
+    return label, _bucket(emotion.get("score"), SCORE_EDGES) if "score" in emotion else -1
+
+
+def decision_cache_key(full_text: str,
+                       emotion_bert: Optional[Dict[str, Any]],
+                       emotion_wav2vec: Optional[Dict[str, Any]],
+                       audio_summary: Optional[Dict[str, Any]]) -> Hashable:
+    audio_summary = audio_summary or {}
+    return (
+        normalize_text(full_text),
+        _emotion_bucket(emotion_bert),
+        _emotion_bucket(emotion_wav2vec),
+        _bucket(audio_summary.get("silence_ratio"), SILENCE_EDGES),
+        _bucket(audio_summary.get("clipping_ratio"), CLIPPING_EDGES),
+        _bucket(audio_summary.get("global_peak_zscore"), PEAK_Z_EDGES),
+    )
+
+
+class DecisionCache:
+    """Thread-safe LRU cache with a per-entry TTL and hit/miss/eviction counters."""
+
+    def __init__(self, max_size: int = DEFAULT_DECISION_CACHE_SIZE,
+                 ttl_s: float = DEFAULT_DECISION_CACHE_TTL_S):
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0.")
+        self.max_size = int(max_size)
+        self.ttl_s = float(ttl_s)
+        self._data: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, decision = item
+            if now >= expires_at:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return dict(decision)
+
+    def put(self, key: Hashable, decision: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_s, dict(decision))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
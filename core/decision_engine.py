@@ -1,7 +1,10 @@
-from typing import Dict, Any
-from .rules import score_urgency, keyword_intent_prior
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from .rules import rules_signals
 from .schema import validate_decision_schema
 
+# One batch item: (full_text, emotion_bert, emotion_wav2vec, audio_summary)
+DecisionInput = Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
 def decide_rules_only(full_text: str,
                       emotion_bert: Dict[str, Any] = None,
                       emotion_wav2vec: Dict[str, Any] = None,
@@ -12,15 +15,30 @@ def decide_rules_only(full_text: str,
     Optionally uses emotion/audio_summary as light overrides for urgency/confidence.
     """
     full_text = (full_text or "").strip()
-    emotion_bert = emotion_bert or {}
-    emotion_wav2vec = emotion_wav2vec or {}
-    audio_summary = audio_summary or {}
 
-    # 1) Urgency from text
-    urgency = score_urgency(full_text)
+    # 1) Urgency + 2) intent prior from text (one keyword scan)
+    urgency, intent, strength = rules_signals(full_text)
+    return _route(urgency, intent, strength, audio_summary or {})
+
+
+def decide_rules_only_batch(items: Sequence[DecisionInput]) -> List[Dict[str, Any]]:
+    """
+    Rules-only decisions for many transcripts, returned in input order.
+    Texts are normalized once and identical texts share a single keyword scan.
+    """
+    signals: Dict[str, Tuple[str, str, float]] = {}
+    out = []
+    for item in items:
+        full_text, _, _, audio_summary = item
+        key = (full_text or "").strip()
+        sig = signals.get(key)
+        if sig is None:
+            sig = signals[key] = rules_signals(key)
+        out.append(_route(*sig, audio_summary or {}))
+    return out
+
 
-    # 2) Intent prior from text
-    intent, strength = keyword_intent_prior(full_text)
+def _route(urgency: str, intent: str, strength: float, audio_summary: Dict[str, Any]) -> Dict[str, Any]:
     if not intent:
         intent = "unknown"
 
@@ -1,13 +1,85 @@
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from core.graph import build_app
+from core.llm_ollama import OllamaDecisionLLM
+from core.prompts import DECISION_SYSTEM_PREFIX
 from core.state import CoreState
+from core.cache import DecisionCache
+from core.decision_engine import DecisionInput, decide_rules_only, decide_rules_only_batch
+from core.static import (DEFAULT_BATCH_CONCURRENCY, DEFAULT_DECISION_CACHE_SIZE,
+                         DEFAULT_DECISION_CACHE_TTL_S, DEFAULT_LLM_DEADLINE_S, DEFAULT_OLLAMA_MODEL)
 
-_APP = build_app(use_llm=True)
+_CACHE: Optional[DecisionCache] = None
+_OPTIONS = {"decide_mode": "llm", "llm_deadline_s": DEFAULT_LLM_DEADLINE_S, "timing": False,
+            "prompt_mode": "inline"}
+# One Ollama client (HTTP pool) for the process, reused by every rebuilt graph.
+# Importing this module makes no network call; preload_core() warms the model.
+_LLM = OllamaDecisionLLM(model=DEFAULT_OLLAMA_MODEL)
+_APP = build_app(use_llm=True, llm=_LLM)
+
+
+_KEEP = object()
+
+
+def _rebuild_app(cache: Any = _KEEP, **changes) -> None:
+    """
+    Rebuild the graph with `changes` applied to the current options (and `cache` unless
+    _KEEP). build_app validates them first: on error nothing is committed, so the running
+    app, the options and the cache stay as they were.
+    """
+    global _APP, _CACHE
+    options = {**_OPTIONS, **changes}
+    cache = _CACHE if cache is _KEEP else cache
+    _APP = build_app(use_llm=True, cache=cache, llm=_LLM, **options)
+    _OPTIONS.update(options)
+    _CACHE = cache
+    # what the client primes at warm-up; decisions pass their system prompt explicitly
+    _LLM.system_prefix = DECISION_SYSTEM_PREFIX if options["prompt_mode"] == "prefix" else None
+
+
+def preload_core(timeout_s: float = 120) -> Dict[str, Any]:
+    """
+    Load the Ollama model (and prime the system prefix in "prefix" prompt mode) once at
+    startup, so the first decision is not cold. Call it again after configure_prompt_mode.
+    """
+    warm = _LLM.warmup(timeout_s=timeout_s)
+    return {"warm": warm, "error": _LLM.warmup_error}
+
+
+def configure_decision_cache(max_size: int = DEFAULT_DECISION_CACHE_SIZE,
+                             ttl_s: float = DEFAULT_DECISION_CACHE_TTL_S) -> Optional[DecisionCache]:
+    """
+    Enable (max_size > 0) or disable (max_size <= 0) the decision cache in front of
+    the decide node. Hit/miss/eviction counters land in CoreState.debug["decision_cache"].
+    """
+    _rebuild_app(cache=DecisionCache(max_size=max_size, ttl_s=ttl_s) if max_size > 0 else None)
+    return _CACHE
+
+
+def configure_decide_mode(decide_mode: str = "llm",
+                          llm_deadline_s: float = DEFAULT_LLM_DEADLINE_S) -> None:
+    """
+    "llm": wait for Ollama (rules only if it errors).
+    "speculative": race rules vs LLM; the LLM gets at most `llm_deadline_s`.
+    """
+    _rebuild_app(decide_mode=decide_mode, llm_deadline_s=llm_deadline_s)
 
-def run_ai_core(full_text: str, emotion_bert: dict, emotion_wav2vec: dict, audio_summary: dict) -> Dict[str, Any]:
-    if hasattr(vector_embedding, "tolist"):
-        vector_embedding = vector_embedding.tolist()
 
+def configure_prompt_mode(prompt_mode: str = "prefix") -> None:
+    """"prefix": constant instructions as Ollama `system` (prefix KV reuse); "inline": legacy prompt."""
+    _rebuild_app(prompt_mode=prompt_mode)
+
+
+def configure_timing(enabled: bool = True) -> None:
+    """Per-node timings in CoreState.debug["timings_ms"] + histograms in core.metrics.METRICS."""
+    _rebuild_app(timing=enabled)
+
+
+def decision_cache_stats() -> Optional[Dict[str, Any]]:
+    return _CACHE.stats() if _CACHE is not None else None
+
+
+def run_ai_core(full_text: str, emotion_bert: dict, emotion_wav2vec: dict, audio_summary: dict) -> Dict[str, Any]:
     state = CoreState(
         full_text=full_text,
         emotion_bert=emotion_bert,
@@ -18,3 +90,40 @@ def run_ai_core(full_text: str, emotion_bert: dict, emotion_wav2vec: dict, audio
     return out["decision"]
 
 
+def _decide_or_fallback(index: int, item: DecisionInput,
+                        on_error: Optional[Callable[[int, Exception], None]]) -> Dict[str, Any]:
+    """run_ai_core on one batch item; rules-only decision if the LLM path raises."""
+    try:
+        return run_ai_core(*item)
+    except Exception as e:  # e.g. ValueError: unparseable LLM output after repair
+        if on_error is not None:
+            on_error(index, e)
+        full_text, emotion_bert, emotion_wav2vec, audio_summary = item
+        return decide_rules_only(full_text, emotion_bert=emotion_bert,
+                                 emotion_wav2vec=emotion_wav2vec, audio_summary=audio_summary)
+
+
+def run_ai_core_batch(items: Sequence[DecisionInput],
+                      use_llm: bool = True,
+                      max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                      on_error: Optional[Callable[[int, Exception], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Decide many (full_text, emotion_bert, emotion_wav2vec, audio_summary) items.
+    Results come back in input order.
+    - use_llm=False: rules only, shared normalization/keyword scans across the batch.
+    - use_llm=True: each item goes through the LLM graph, with at most
+      `max_concurrency` Ollama requests in flight. An item whose LLM path raises gets
+      the rules-only decision instead of failing the batch; `on_error(index, exc)` is
+      called for it.
+    """
+    items = list(items)
+    if not use_llm:
+        return decide_rules_only_batch(items)
+    if not items:
+        return []
+
+    workers = max(1, min(int(max_concurrency), len(items)))
+    if workers == 1:
+        return [_decide_or_fallback(i, item, on_error) for i, item in enumerate(items)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-core") as ex:
+        return list(ex.map(lambda args: _decide_or_fallback(*args, on_error), enumerate(items)))
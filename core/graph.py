@@ -1,15 +1,27 @@
 # LangGraph orchestration of the AI Core.
-# Nodes: preprocess -> decide -> (optional feedback stub)
+# Nodes: preprocess -> [cache_lookup] -> decide -> [cache_store] -> (optional feedback stub)
+# decide_mode: "llm" (LLM, rules on Ollama error) or "speculative" (rules vs LLM race).
+# timing=True wraps every node with perf_counter timing (CoreState.debug["timings_ms"])
+# and folds each run into the process-wide core.metrics.METRICS.
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import concurrent.futures
+import threading
+import time
 from requests.exceptions import RequestException
 from langgraph.graph import StateGraph, END
 
 from .state import CoreState
-from .decision_engine import decide_rules_only, retrieval_brief
-from .prompts import decision_prompt
+from .decision_engine import decide_rules_only
+from .prompts import decision_prompt, decision_prompt_suffix, DECISION_SYSTEM_PREFIX, PROMPT_MODES
 from .llm_ollama import OllamaDecisionLLM
-from .static import DEFAULT_OLLAMA_MODEL
+from .cache import DecisionCache, decision_cache_key
+from .schema import validate_decision_schema
+from .metrics import METRICS, CoreMetrics
+from .static import DEFAULT_OLLAMA_MODEL, DEFAULT_LLM_DEADLINE_S
+
+DECIDE_MODES = ("llm", "speculative")
 
 def node_preprocess(state: CoreState) -> CoreState:
     # Keep debug small + useful
@@ -31,28 +43,153 @@ def node_decide_rules(state: CoreState) -> CoreState:
     return state
 
 
-def node_decide_with_llm(state: CoreState, llm: OllamaDecisionLLM) -> CoreState:
-    # LLM is the primary decider: it must output the strict schema JSON
-    prompt = decision_prompt(
+def build_prompt(state: CoreState, prompt_mode: str = "inline") -> Tuple[str, Optional[str]]:
+    """(prompt, system) for the LLM call; "prefix" keeps the instructions in a constant system prefix."""
+    fields = dict(
         full_text=state.full_text,
         emotion_bert=state.emotion_bert,
         emotion_wav2vec=state.emotion_wav2vec,
         audio_summary=state.audio_summary,
     )
+    if prompt_mode == "prefix":
+        return decision_prompt_suffix(**fields), DECISION_SYSTEM_PREFIX
+    return decision_prompt(**fields), None
+
+
+def node_decide_with_llm(state: CoreState, llm: OllamaDecisionLLM, prompt_mode: str = "inline") -> CoreState:
+    # LLM is the primary decider: it must output the strict schema JSON
+    prompt, system = build_prompt(state, prompt_mode)
 
     try:
-        decision = llm.decide_json(prompt)
+        decision = llm.decide_json(prompt, system=system)
         state.debug["mode"] = "ollama_llm"
-    except RequestException as e:
-        # If Ollama isn't running, fall back
-        decision = decide_rules_only(state.full_text)
+        if llm.last_stats is not None:
+            state.debug["llm_stream"] = dict(llm.last_stats)
+        if llm.last_repair is not None:
+            state.debug["repair"] = dict(llm.last_repair)
+    except (RequestException, ValueError) as e:
+        # Ollama not running, or output unparseable even after repair: fall back
+        # (same as speculative mode, so both count in the Ollama error rate)
+        decision = decide_rules_only(state.full_text or "",
+                                     emotion_bert=state.emotion_bert,
+                                     emotion_wav2vec=state.emotion_wav2vec,
+                                     audio_summary=state.audio_summary)
         state.debug["mode"] = "rules_fallback"
         state.debug["ollama_error"] = str(e)
+        if isinstance(e, ValueError) and llm.last_repair is not None:
+            state.debug["repair"] = dict(llm.last_repair)
 
     state.decision = decision
     return state
 
 
+class _BackgroundLoop:
+    """One daemon asyncio loop for speculative LLM calls (so they can be truly cancelled)."""
+
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ai-core-llm-loop", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+
+_LLM_LOOP = _BackgroundLoop()
+
+
+def rules_are_decisive(decision: Dict[str, Any]) -> bool:
+    # urgency=high always escalates, whatever the LLM would say.
+    return decision.get("urgency") == "high"
+
+
+async def _llm_task(llm: OllamaDecisionLLM, prompt: str, system: Optional[str]):
+    decision = await llm.adecide_json(prompt, system=system)
+    return decision, llm.last_stats, llm.last_repair
+
+
+def node_decide_speculative(state: CoreState, llm: OllamaDecisionLLM, deadline_s: float,
+                            prompt_mode: str = "inline") -> CoreState:
+    """
+    Start the LLM call, compute the rules decision meanwhile, and:
+    - return rules at once (and cancel the LLM) when they are decisive,
+    - else wait for the LLM until `deadline_s` after the start, then fall back to rules.
+    """
+    t0 = time.perf_counter()
+    prompt, system = build_prompt(state, prompt_mode)
+    fut = _LLM_LOOP.submit(_llm_task(llm, prompt, system))
+
+    rules = decide_rules_only(state.full_text or "",
+                              emotion_bert=state.emotion_bert,
+                              emotion_wav2vec=state.emotion_wav2vec,
+                              audio_summary=state.audio_summary)
+    race = {"deadline_s": deadline_s, "llm_cancelled": False}
+
+    if rules_are_decisive(rules):
+        race["winner"] = "rules_decisive"
+        race["llm_cancelled"] = fut.cancel()
+        state.decision = rules
+        state.debug["mode"] = "rules_decisive"
+    else:
+        remaining = max(0.0, deadline_s - (time.perf_counter() - t0))
+        try:
+            decision, stream_stats, repair = fut.result(timeout=remaining)
+            race["winner"] = "llm"
+            state.decision = decision
+            state.debug["mode"] = "ollama_llm"
+            if stream_stats is not None:
+                state.debug["llm_stream"] = dict(stream_stats)
+            if repair is not None:
+                state.debug["repair"] = dict(repair)
+        except concurrent.futures.TimeoutError:
+            race["winner"] = "rules_deadline"
+            race["llm_cancelled"] = fut.cancel()
+            state.decision = rules
+            state.debug["mode"] = "rules_fallback"
+        except (RequestException, ValueError) as e:
+            race["winner"] = "rules_error"
+            state.decision = rules
+            state.debug["mode"] = "rules_fallback"
+            state.debug["ollama_error"] = str(e)
+
+    race["elapsed_ms"] = round(1000.0 * (time.perf_counter() - t0), 2)
+    state.debug["race"] = race
+    return state
+
+
+def node_cache_lookup(state: CoreState, cache: DecisionCache) -> CoreState:
+    key = decision_cache_key(state.full_text, state.emotion_bert,
+                             state.emotion_wav2vec, state.audio_summary)
+    decision = cache.get(key)
+    if decision is not None:
+        try:
+            validate_decision_schema(decision)
+        except ValueError:
+            decision = None
+    if decision is not None:
+        state.decision = decision
+        state.debug["mode"] = "cache"
+    state.debug["decision_cache"] = {"hit": decision is not None, **cache.stats()}
+    return state
+
+
+def node_cache_store(state: CoreState, cache: DecisionCache) -> CoreState:
+    # Degraded fallback decisions (Ollama down) are not worth pinning in the cache.
+    if state.decision is not None and state.debug.get("mode") != "rules_fallback":
+        key = decision_cache_key(state.full_text, state.emotion_bert,
+                                 state.emotion_wav2vec, state.audio_summary)
+        cache.put(key, state.decision)
+        state.debug["decision_cache"] = {"hit": False, **cache.stats()}
+    return state
+
+
+def route_after_cache(state: CoreState) -> str:
+    return "feedback" if state.debug.get("decision_cache", {}).get("hit") else "decide"
+
+
 def node_feedback_stub(state: CoreState) -> CoreState:
     # Placeholder: store after-call rating later (no runtime cost now).
     state.debug["feedback_placeholder"] = {
@@ -64,21 +201,69 @@ def node_feedback_stub(state: CoreState) -> CoreState:
     return state
 
 
-def build_app(use_llm: bool = True, ollama_model: str = DEFAULT_OLLAMA_MODEL) -> Any:
+def timed_node(name: str, fn: Callable[[CoreState], CoreState]) -> Callable[[CoreState], CoreState]:
+    def run(state: CoreState) -> CoreState:
+        t0 = time.perf_counter()
+        out = fn(state)
+        out.debug.setdefault("timings_ms", {})[name] = round(1000.0 * (time.perf_counter() - t0), 3)
+        return out
+    return run
+
+
+def node_metrics(state: CoreState, metrics: CoreMetrics) -> CoreState:
+    metrics.record_run(state.debug)
+    return state
+
+
+def build_app(use_llm: bool = True, ollama_model: str = DEFAULT_OLLAMA_MODEL,
+              cache: Optional[DecisionCache] = None,
+              decide_mode: str = "llm", llm_deadline_s: float = DEFAULT_LLM_DEADLINE_S,
+              llm: Optional[OllamaDecisionLLM] = None,
+              timing: bool = False, metrics: Optional[CoreMetrics] = None,
+              prompt_mode: str = "inline") -> Any:
+    if decide_mode not in DECIDE_MODES:
+        raise ValueError(f"decide_mode must be one of {DECIDE_MODES}.")
+    if prompt_mode not in PROMPT_MODES:
+        raise ValueError(f"prompt_mode must be one of {PROMPT_MODES}.")
     g = StateGraph(CoreState)
-    g.add_node("preprocess", node_preprocess)
+
+    def add(name: str, fn: Callable[[CoreState], CoreState]) -> None:
+        g.add_node(name, timed_node(name, fn) if timing else fn)
+
+    add("preprocess", node_preprocess)
 
     if use_llm:
-        llm = OllamaDecisionLLM(model=ollama_model)
-        g.add_node("decide", lambda s: node_decide_with_llm(s, llm))
+        # In prefix mode the client primes the system prefix right after its warm-up.
+        llm = llm or OllamaDecisionLLM(model=ollama_model,
+                                       system_prefix=DECISION_SYSTEM_PREFIX if prompt_mode == "prefix" else None)
+        if decide_mode == "speculative":
+            add("decide", lambda s: node_decide_speculative(s, llm, llm_deadline_s, prompt_mode))
+        else:
+            add("decide", lambda s: node_decide_with_llm(s, llm, prompt_mode))
     else:
-        g.add_node("decide", node_decide_rules)
+        add("decide", node_decide_rules)
 
-    g.add_node("feedback", node_feedback_stub)
+    add("feedback", node_feedback_stub)
 
     g.set_entry_point("preprocess")
-    g.add_edge("preprocess", "decide")
-    g.add_edge("decide", "feedback")
-    g.add_edge("feedback", END)
+    if cache is not None:
+        # A hit jumps straight to feedback: the decide node never runs.
+        add("cache_lookup", lambda s: node_cache_lookup(s, cache))
+        add("cache_store", lambda s: node_cache_store(s, cache))
+        g.add_edge("preprocess", "cache_lookup")
+        g.add_conditional_edges("cache_lookup", route_after_cache, {"decide": "decide", "feedback": "feedback"})
+        g.add_edge("decide", "cache_store")
+        g.add_edge("cache_store", "feedback")
+    else:
+        g.add_edge("preprocess", "decide")
+        g.add_edge("decide", "feedback")
+
+    if timing:
+        metrics = metrics or METRICS
+        g.add_node("metrics", lambda s: node_metrics(s, metrics))
+        g.add_edge("feedback", "metrics")
+        g.add_edge("metrics", END)
+    else:
+        g.add_edge("feedback", END)
 
-    return g.compile()
\ No newline at end of file
+    return g.compile()
@@ -1,53 +1,409 @@
 # Ollama client for decision JSON generation.
 # Uses short prompts, strict JSON parsing, and one repair attempt.
+# One pooled HTTP session per client (sync) + a lazily created httpx client (async).
+# Streaming mode stops reading as soon as a complete, schema-valid object arrived.
+# Near-miss outputs are fixed locally (core/repair.py) before the LLM repair call.
 
 from typing import Dict, Any, Optional
+import asyncio
+import contextvars
 import json
+import threading
+import time
 import requests
-from .schema import validate_decision_schema
+from requests.adapters import HTTPAdapter
+from .schema import DECISION_JSON_SCHEMA
+from .repair import is_canonical, repair_decision
+from .static import (DEFAULT_OLLAMA_KEEP_ALIVE, DEFAULT_OLLAMA_POOL_SIZE,
+                     DEFAULT_OLLAMA_STREAM, DEFAULT_OLLAMA_FORMAT)
+
+
+def _ms_since(t0: float) -> float:
+    return round(1000.0 * (time.perf_counter() - t0), 3)
+
+
+class _JsonObjectScanner:
+    """Incremental brace matcher over streamed text; stops at the first valid decision."""
+
+    def __init__(self):
+        self.text = ""
+        self.end = -1          # index just past the accepted object
+        self._i = 0
+        self._depth = 0
+        self._start = -1
+        self._in_str = False
+        self._esc = False
+
+    def feed(self, piece: str) -> bool:
+        self.text += piece
+        t = self.text
+        while self._i < len(t):
+            ch = t[self._i]
+            self._i += 1
+            if not self._depth:
+                if ch == "{":
+                    self._depth, self._start = 1, self._i - 1
+            elif self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if not self._depth and self._valid(t[self._start:self._i]):
+                    self.end = self._i
+                    return True
+        return False
+
+    @staticmethod
+    def _valid(candidate: str) -> bool:
+        try:
+            if is_canonical(json.loads(candidate)):
+                return True
+        except ValueError:  # JSONDecodeError is a ValueError
+            pass
+        # A locally repairable object is complete enough to stop the stream.
+        return repair_decision(candidate, count=False)[0] is not None
+
+    def result(self) -> str:
+        return self.text[:self.end] if self.end >= 0 else self.text
+
+
+class _StreamMeter:
+    """Tokens/time of one streamed generation."""
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+        self.t0 = time.perf_counter()
+        self.t_first = None
+        self.tokens = 0
+
+    def token(self) -> None:
+        if self.t_first is None:
+            self.t_first = time.perf_counter()
+        self.tokens += 1
+
+    def finish(self, early_stop: bool) -> Dict[str, Any]:
+        total_ms = 1000.0 * (time.perf_counter() - self.t0)
+        ttft_ms = 1000.0 * (self.t_first - self.t0) if self.t_first is not None else total_ms
+        per_token_ms = (total_ms - ttft_ms) / max(1, self.tokens - 1)
+        # num_predict budget left when the stream was closed early. Not a measured saving:
+        # the model may have stopped on its own well before it (compare with a non-streamed
+        # run for that, e.g. core_bench's llm vs llm_stream modes).
+        unused = max(0, self.max_tokens - self.tokens) if early_stop else 0
+        return {
+            "tokens": self.tokens,
+            "early_stop": early_stop,
+            "ttft_ms": round(ttft_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "unused_budget_tokens": unused,
+            "unused_budget_ms": round(unused * per_token_ms, 2),
+        }
+
 
 class OllamaDecisionLLM:
-    def __init__(self, model: str, base_url: str = "http://localhost:11434", timeout_s: float = 5):
+    def __init__(self, model: str, base_url: str = "http://localhost:11434", timeout_s: float = 5,
+                 keep_alive: str = DEFAULT_OLLAMA_KEEP_ALIVE,
+                 pool_size: int = DEFAULT_OLLAMA_POOL_SIZE,
+                 warmup: bool = False, warmup_timeout_s: float = 120,
+                 stream: bool = DEFAULT_OLLAMA_STREAM,
+                 json_format: Optional[str] = DEFAULT_OLLAMA_FORMAT,
+                 system_prefix: Optional[str] = None):
         self.model = model
         self.base_url = base_url.rstrip("/")
         self.timeout_s = timeout_s
+        self.keep_alive = keep_alive
+        self.pool_size = pool_size
+        # stream=True: read tokens incrementally and hang up once the decision is complete.
+        self.stream = stream
+        # Ollama `format`: None, "json" (JSON mode) or "schema" (DECISION_JSON_SCHEMA).
+        self.json_format = DECISION_JSON_SCHEMA if json_format == "schema" else json_format
+        # Constant instructions sent as Ollama `system`: identical leading tokens on every call,
+        # so the runner reuses the cached prefix (KV) and only evaluates the per-call prompt.
+        self.system_prefix = system_prefix
 
-    def _generate(self, prompt: str, max_tokens: int = 120) -> str:
-        url = f"{self.base_url}/api/generate"
+        # Per-decision stream stats (context-local: safe across threads and asyncio tasks)
+        # + process totals for this client.
+        self._last_stats = contextvars.ContextVar(f"ollama_stats_{id(self)}", default=None)
+        self._last_repair = contextvars.ContextVar(f"ollama_repair_{id(self)}", default=None)
+        self._totals_lock = threading.Lock()
+        self.stream_totals = {"generations": 0, "early_stops": 0, "tokens": 0,
+                              "unused_budget_tokens": 0, "unused_budget_ms": 0.0}
+
+        # Keep-alive connection pool shared by every call from this client.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._aclient = None
+        self._aclient_loop = None
+
+        # No network at construction: call warmup() (or pass warmup=True to run it in a
+        # background thread) to load the model into Ollama memory before the first call.
+        self.warm = False
+        self.warmup_error: Optional[str] = None
+        self._warm_thread = None
+        if warmup:
+            self._warm_thread = threading.Thread(target=self.warmup, args=(warmup_timeout_s,),
+                                                 name="ollama-warmup", daemon=True)
+            self._warm_thread.start()
+
+    def _payload(self, prompt: str, max_tokens: int, system: Optional[str] = None) -> Dict[str, Any]:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": self.stream,
+            "keep_alive": self.keep_alive,
             "options": {
                 "num_predict": max_tokens,
                 "temperature": 0.1,  # stable JSON
                 "top_p": 0.9,
             }
         }
-        r = requests.post(url, json=payload, timeout=self.timeout_s)
+        if self.json_format is not None:
+            payload["format"] = self.json_format
+        system = system if system is not None else self.system_prefix
+        if system is not None:
+            payload["system"] = system
+        return payload
+
+    @property
+    def last_stats(self) -> Optional[Dict[str, Any]]:
+        """Stream stats of the last decide_json/adecide_json in the current context."""
+        return self._last_stats.get()
+
+    @property
+    def last_repair(self) -> Optional[Dict[str, Any]]:
+        """Repairs applied to the last decision: local paths + whether the LLM repair ran."""
+        return self._last_repair.get()
+
+    def _begin_stats(self) -> None:
+        self._last_repair.set({"local": [], "llm_repair": False})
+        if self.stream:
+            self._last_stats.set({"generations": 0, "tokens": 0, "early_stop": False,
+                                  "ttft_ms": None, "total_ms": 0.0,
+                                  "unused_budget_tokens": 0, "unused_budget_ms": 0.0})
+
+    def _record_stream(self, gen: Dict[str, Any]) -> None:
+        stats = self._last_stats.get()
+        if stats is not None:
+            stats["generations"] += 1
+            stats["tokens"] += gen["tokens"]
+            stats["early_stop"] = gen["early_stop"]
+            if stats["ttft_ms"] is None:
+                stats["ttft_ms"] = gen["ttft_ms"]
+            stats["total_ms"] = round(stats["total_ms"] + gen["total_ms"], 2)
+            stats["unused_budget_tokens"] += gen["unused_budget_tokens"]
+            stats["unused_budget_ms"] = round(stats["unused_budget_ms"] + gen["unused_budget_ms"], 2)
+        with self._totals_lock:
+            t = self.stream_totals
+            t["generations"] += 1
+            t["early_stops"] += int(gen["early_stop"])
+            t["tokens"] += gen["tokens"]
+            t["unused_budget_tokens"] += gen["unused_budget_tokens"]
+            t["unused_budget_ms"] = round(t["unused_budget_ms"] + gen["unused_budget_ms"], 2)
+
+    def warmup(self, timeout_s: float = 120) -> bool:
+        """Empty-prompt generate: Ollama loads the model and keeps it for `keep_alive`."""
+        url = f"{self.base_url}/api/generate"
+        try:
+            r = self.session.post(url, json={"model": self.model, "prompt": "", "keep_alive": self.keep_alive},
+                                  timeout=timeout_s)
+            r.raise_for_status()
+            if self.system_prefix is not None:
+                self.prime_prefix(timeout_s=timeout_s)
+            self.warm, self.warmup_error = True, None
+        except requests.RequestException as e:
+            self.warm, self.warmup_error = False, str(e)
+        return self.warm
+
+    def prime_prefix(self, system: Optional[str] = None, timeout_s: float = 120) -> None:
+        """Evaluate the system prefix once (1 token) so the first real call finds it cached."""
+        payload = self._payload(".", max_tokens=1, system=system)
+        payload["stream"] = False
+        payload.pop("format", None)
+        r = self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout_s)
+        r.raise_for_status()
+
+    def wait_warm(self, timeout_s: Optional[float] = None) -> bool:
+        if self._warm_thread is not None:
+            self._warm_thread.join(timeout_s)
+        return self.warm
+
+    def _generate(self, prompt: str, max_tokens: int = 120, system: Optional[str] = None) -> str:
+        url = f"{self.base_url}/api/generate"
+        payload = self._payload(prompt, max_tokens, system)
+        if self.stream:
+            return self._generate_stream(url, payload, max_tokens)
+        r = self.session.post(url, json=payload, timeout=self.timeout_s)
         r.raise_for_status()
         return r.json().get("response", "")
 
-    def decide_json(self, prompt: str) -> Dict[str, Any]:
-        # Attempt 1
-        txt = self._generate(prompt)
-        obj = self._try_parse(txt)
+    def _generate_stream(self, url: str, payload: Dict[str, Any], max_tokens: int) -> str:
+        scanner, meter = _JsonObjectScanner(), _StreamMeter(max_tokens)
+        early_stop = False
+        # Leaving the `with` early closes the connection, which makes Ollama stop decoding.
+        with self.session.post(url, json=payload, stream=True, timeout=self.timeout_s) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                status = self._stream_line(line, scanner, meter)
+                if status:
+                    early_stop = status == "complete"
+                    break
+        self._record_stream(meter.finish(early_stop))
+        return scanner.result()
+
+    async def _agenerate(self, prompt: str, max_tokens: int = 120, system: Optional[str] = None) -> str:
+        import httpx
+
+        url = f"{self.base_url}/api/generate"
+        payload = self._payload(prompt, max_tokens, system)
+        try:
+            if self.stream:
+                return await self._agenerate_stream(url, payload, max_tokens)
+            client = await self._async_client()
+            r = await client.post(url, json=payload)
+            r.raise_for_status()
+        except httpx.TimeoutException as e:
+            # Same error surface as the sync path (graph falls back on RequestException).
+            raise requests.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.RequestException(str(e)) from e
+        return r.json().get("response", "")
+
+    async def _agenerate_stream(self, url: str, payload: Dict[str, Any], max_tokens: int) -> str:
+        scanner, meter = _JsonObjectScanner(), _StreamMeter(max_tokens)
+        early_stop = False
+        client = await self._async_client()
+        async with client.stream("POST", url, json=payload) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                status = self._stream_line(line, scanner, meter)
+                if status:
+                    early_stop = status == "complete"
+                    break
+        self._record_stream(meter.finish(early_stop))
+        return scanner.result()
+
+    @staticmethod
+    def _stream_line(line, scanner: _JsonObjectScanner, meter: _StreamMeter) -> Optional[str]:
+        """Feed one NDJSON line: "complete" (decision object ready), "done" (model finished) or None."""
+        if not line:
+            return None
+        chunk = json.loads(line)
+        if "error" in chunk:
+            raise requests.RequestException(f"Ollama stream error: {chunk['error']}")
+        piece = chunk.get("response", "")
+        if piece:
+            meter.token()
+            if scanner.feed(piece):
+                return "complete"
+        return "done" if chunk.get("done") else None
+
+    async def _async_client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._aclient is not None and self._aclient_loop is not loop:
+            await self._close_stale_aclient()
+        if self._aclient is None:
+            limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            self._aclient = httpx.AsyncClient(timeout=self.timeout_s, limits=limits)
+            self._aclient_loop = loop
+        return self._aclient
+
+    async def _close_stale_aclient(self) -> None:
+        """Close the httpx client made on another event loop (it is bound to that loop)."""
+        client, loop = self._aclient, self._aclient_loop
+        self._aclient = self._aclient_loop = None
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except (RuntimeError, OSError):  # sockets of a closed loop
+            pass
+
+    def decide_json(self, prompt: str, system: Optional[str] = None) -> Dict[str, Any]:
+        self._begin_stats()
+        info = self._last_repair.get()
+        # Attempt 1 (+ deterministic local repair)
+        t0 = time.perf_counter()
+        txt = self._generate(prompt, system=system)
+        info["generate_ms"] = _ms_since(t0)
+        obj = self._local_decision(txt)
         if obj is not None:
-            validate_decision_schema(obj)
             return obj
 
         # Repair attempt (keep it short)
-        repair_prompt = (
+        info["llm_repair"] = True
+        t0 = time.perf_counter()
+        try:
+            txt2 = self._generate(self._repair_prompt(txt), max_tokens=140, system=system)
+            return self._parse_repaired(txt2)
+        finally:
+            info["llm_repair_ms"] = _ms_since(t0)
+
+    async def adecide_json(self, prompt: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """asyncio counterpart of decide_json (same single repair attempt)."""
+        self._begin_stats()
+        info = self._last_repair.get()
+        t0 = time.perf_counter()
+        txt = await self._agenerate(prompt, system=system)
+        info["generate_ms"] = _ms_since(t0)
+        obj = self._local_decision(txt)
+        if obj is not None:
+            return obj
+
+        info["llm_repair"] = True
+        t0 = time.perf_counter()
+        try:
+            txt2 = await self._agenerate(self._repair_prompt(txt), max_tokens=140, system=system)
+            return self._parse_repaired(txt2)
+        finally:
+            info["llm_repair_ms"] = _ms_since(t0)
+
+    def close(self) -> None:
+        self.session.close()
+
+    async def aclose(self) -> None:
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = self._aclient_loop = None
+
+    @staticmethod
+    def _repair_prompt(txt: str) -> str:
+        return (
             "Corrige la sortie suivante pour qu'elle soit UNIQUEMENT un JSON valide "
             "avec EXACTEMENT les clés intent, urgency, action, confidence, et rien d'autre.\n"
             f"SORTIE À CORRIGER:\n{txt}\nJSON:"
         )
-        txt2 = self._generate(repair_prompt, max_tokens=140)
-        obj2 = self._try_parse(txt2)
-        if obj2 is None:
+
+    def _local_decision(self, txt: str) -> Optional[Dict[str, Any]]:
+        """Strict parse of a canonical decision first, then the local repair layer; None if both fail."""
+        obj = self._try_parse(txt)
+        if is_canonical(obj):
+            return obj
+        t0 = time.perf_counter()
+        obj, fixes = repair_decision(txt)
+        info = self._last_repair.get()
+        if info is not None:
+            info["local"].extend(fixes if obj is not None else [])
+            info["local_repair_ms"] = round(info.get("local_repair_ms", 0.0) + _ms_since(t0), 3)
+        return obj
+
+    def _parse_repaired(self, txt: str) -> Dict[str, Any]:
+        obj = self._local_decision(txt)
+        if obj is None:
             raise ValueError("LLM output is not parseable JSON after repair.")
-        validate_decision_schema(obj2)
-        return obj2
+        return obj
 
     @staticmethod
     def _try_parse(text: str) -> Optional[Dict[str, Any]]:
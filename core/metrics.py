@@ -0,0 +1,165 @@
+# Process-wide latency histograms and counters for the LangGraph core app.
+# Filled by build_app(timing=True); dump with METRICS.snapshot()/dump(), or scrape
+# METRICS.to_prometheus() (start_metrics_server() serves it on /metrics).
+
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple
+import json
+import math
+import threading
+
+from .static import DEFAULT_METRICS_WINDOW
+
+QUANTILES = (0.50, 0.95, 0.99)
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1))
+    return float(sorted_values[k])
+
+
+class LatencyHistogram:
+    """Count/sum over the whole process + a bounded window of recent samples for percentiles."""
+
+    def __init__(self, window: int = DEFAULT_METRICS_WINDOW):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+
+    def summary(self) -> Dict[str, Any]:
+        values = sorted(self.recent)
+        out = {"count": self.count,
+               "sum_ms": round(self.total_ms, 3),
+               "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+               "max_ms": round(self.max_ms, 3)}
+        for q in QUANTILES:
+            out[f"p{int(q * 100)}_ms"] = round(percentile(values, q), 3)
+        return out
+
+
+class CoreMetrics:
+    def __init__(self, window: int = DEFAULT_METRICS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._hist: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._counters: Counter = Counter()
+
+    def observe(self, stage: str, mode: str, ms: float) -> None:
+        with self._lock:
+            h = self._hist.get((stage, mode))
+            if h is None:
+                h = self._hist[(stage, mode)] = LatencyHistogram(self.window)
+            h.observe(ms)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def record_run(self, debug: Dict[str, Any]) -> None:
+        """Fold one finished graph run (its CoreState.debug) into the histograms/counters."""
+        mode = debug.get("mode", "unknown")
+        timings = debug.get("timings_ms", {})
+        for stage, ms in timings.items():
+            self.observe(stage, mode, ms)
+        self.observe("total", mode, sum(timings.values()))
+
+        repair = debug.get("repair") or {}
+        for stage in ("generate", "local_repair", "llm_repair"):
+            if f"{stage}_ms" in repair:
+                self.observe(f"decide.{stage}", mode, repair[f"{stage}_ms"])
+
+        with self._lock:
+            c = self._counters
+            c[f"decisions.{mode}"] += 1
+            if mode in ("ollama_llm", "rules_fallback"):
+                c["ollama_calls"] += 1
+            if "ollama_error" in debug:
+                c["ollama_errors"] += 1
+            if repair.get("local"):
+                c["local_repairs"] += 1
+            if repair.get("llm_repair"):
+                c["llm_repair_attempts"] += 1
+            race = debug.get("race")
+            if race:
+                c[f"race.{race.get('winner')}"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hist = {f"{stage}|{mode}": h.summary() for (stage, mode), h in sorted(self._hist.items())}
+            counters = dict(self._counters)
+        calls = counters.get("ollama_calls", 0)
+        return {
+            "latency": hist,
+            "counters": counters,
+            "ollama_error_rate": round(counters.get("ollama_errors", 0) / calls, 4) if calls else 0.0,
+            "llm_repair_rate": round(counters.get("llm_repair_attempts", 0) / calls, 4) if calls else 0.0,
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def to_prometheus(self, prefix: str = "ai_core") -> str:
+        snap = self.snapshot()
+        lines = [f"# TYPE {prefix}_node_latency_ms summary"]
+        for key, s in snap["latency"].items():
+            stage, mode = key.split("|", 1)
+            labels = f'node="{stage}",mode="{mode}"'
+            for q in QUANTILES:
+                lines.append(f'{prefix}_node_latency_ms{{{labels},quantile="{q}"}} {s[f"p{int(q * 100)}_ms"]}')
+            lines.append(f"{prefix}_node_latency_ms_count{{{labels}}} {s['count']}")
+            lines.append(f"{prefix}_node_latency_ms_sum{{{labels}}} {s['sum_ms']}")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, v in sorted(snap["counters"].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {v}')
+        for name in ("ollama_error_rate", "llm_repair_rate"):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {snap[name]}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = CoreMetrics()
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1",
+                         metrics: Optional[CoreMetrics] = None) -> ThreadingHTTPServer:
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+    metrics = metrics or METRICS
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, ctype = metrics.to_prometheus().encode(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, ctype = json.dumps(metrics.snapshot()).encode(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="ai-core-metrics", daemon=True).start()
+    return server
@@ -1,8 +1,20 @@
 # Prompts are isolated for easier iteration.
 # This is designed for "JSON only" decision output.
+#
+# Two layouts:
+# - decision_prompt(): legacy single prompt (instructions + fields).
+# - DECISION_SYSTEM_PREFIX + decision_prompt_suffix(): the instructions are a constant,
+#   byte-identical prefix (sent as Ollama `system`), only the short suffix changes per
+#   call, so Ollama can reuse the prefix KV cache between calls.
+
+from numbers import Number
+from typing import Any, Dict
+import json
 
 from .static import INTENTS, ALLOWED_URGENCY, ALLOWED_ACTION
 
+PROMPT_MODES = ("inline", "prefix")
+
 def decision_prompt(full_text: str, emotion_bert: dict, emotion_wav2vec: dict, audio_summary: dict) -> str:
     intents = ", ".join(INTENTS)
     urg = ", ".join(ALLOWED_URGENCY)
@@ -37,3 +49,57 @@ def decision_prompt(full_text: str, emotion_bert: dict, emotion_wav2vec: dict, a
     \"\"\"{full_text}\"\"\"
     JSON:
     """
+
+
+DECISION_SYSTEM_PREFIX = f"""Tu es un moteur de décision pour un callbot d'assurance (accidents de la vie).
+Ta tâche: produire UNIQUEMENT un JSON valide selon le schéma EXACT ci-dessous.
+
+SCHÉMA JSON (clés exactes, aucune clé en plus):
+{{"intent": "<un des intents>", "urgency": "<low|med|high>", "action": "<rag_query|escalate>", "confidence": <float entre 0.0 et 1.0>}}
+
+INTENTS autorisés: {", ".join(INTENTS)}
+URGENCY autorisés: {", ".join(ALLOWED_URGENCY)}
+ACTION autorisés: {", ".join(ALLOWED_ACTION)}
+
+RÈGLES:
+- Retourne seulement le JSON (pas de texte avant/après).
+- Si danger/urgence médicale probable -> urgency="high" et action="escalate".
+- Si confiance faible ou intent incertain -> action="escalate".
+- Sinon -> action="rag_query".
+"""
+
+
+_DROP = object()
+
+
+def _compact(value: Any) -> Any:
+    # Keep scalars (and short lists of scalars); drop arrays such as wav2vec's audio_signal.
+    if value is None or isinstance(value, (str, bool)):
+        return value
+    if isinstance(value, Number):
+        v = float(value)
+        return int(v) if v.is_integer() and not isinstance(value, float) else round(v, 3)
+    if isinstance(value, (list, tuple)) and len(value) <= 16:
+        items = [_compact(v) for v in value]
+        return items if all(i is not _DROP for i in items) else _DROP
+    return _DROP
+
+
+def compact_signals(signals: Dict[str, Any]) -> str:
+    """Deterministic, short JSON for an emotion/audio_summary dict."""
+    out = {}
+    for k in sorted(signals or {}):
+        v = _compact(signals[k])
+        if v is not _DROP:
+            out[str(k)] = v
+    return json.dumps(out, ensure_ascii=False, separators=(",", ":"))
+
+
+def decision_prompt_suffix(full_text: str, emotion_bert: dict, emotion_wav2vec: dict, audio_summary: dict) -> str:
+    return (
+        f"emotion_bert: {compact_signals(emotion_bert)}\n"
+        f"emotion_wav2vec: {compact_signals(emotion_wav2vec)}\n"
+        f"audio_summary: {compact_signals(audio_summary)}\n"
+        f"TEXTE COMPLET de l'appelant:\n\"\"\"{(full_text or '').strip()}\"\"\"\n"
+        "JSON:"
+    )
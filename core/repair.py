@@ -0,0 +1,222 @@
+# Deterministic local repair of near-miss LLM decision outputs.
+# Runs before any second (repair) LLM round trip; stdlib only.
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import difflib
+import json
+import re
+import threading
+import unicodedata
+
+from .schema import REQUIRED_KEYS, validate_decision_schema
+from .static import INTENTS, ALLOWED_URGENCY, ALLOWED_ACTION
+
+REPAIR_PATHS = (
+    "trailing_text",       # prose / a second object around the JSON
+    "french_quotes",       # « intent » / “intent” / ‘intent’
+    "single_quotes",       # {'intent': 'x'}
+    "missing_braces",      # "intent": ..., "urgency": ... without { } (or one missing)
+    "trailing_comma",      # {..., }
+    "extra_keys",          # keys outside the schema
+    "enum_case",           # "HIGH", " Escalate "
+    "urgency_alias",       # medium -> med, haute -> high ...
+    "intent_fuzzy",        # declaration_sinistres -> declaration_sinistre
+    "confidence_coerced",  # "0.8", "80%", 80
+)
+
+URGENCY_ALIASES = {
+    "medium": "med", "moderate": "med", "moyen": "med", "moyenne": "med", "modere": "med",
+    "haute": "high", "haut": "high", "elevee": "high", "eleve": "high", "critique": "high",
+    "basse": "low", "bas": "low", "faible": "low",
+}
+INTENT_CUTOFF = 0.8
+# Catalog intents + the rules' own fallback label: accepted as they are, never fuzzed.
+CANONICAL_INTENTS = INTENTS + ("unknown",)
+
+_COUNTS: Counter = Counter()
+_COUNTS_LOCK = threading.Lock()
+
+_FR_QUOTES = str.maketrans({"«": '"', "»": '"', "“": '"', "”": '"', "„": '"', "‘": "'", "’": "'"})
+_FR_QUOTE_PAD = re.compile(r'\s*"\s*')
+_SINGLE_QUOTED = re.compile(r"(?<=[{,:\[\s])'([^'\"]*)'(?=\s*[:,}\]])")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PCT = re.compile(r"^\s*([0-9]+(?:[.,][0-9]+)?)\s*(%?)\s*$")
+
+
+def repair_stats() -> Dict[str, int]:
+    with _COUNTS_LOCK:
+        return {k: _COUNTS.get(k, 0) for k in REPAIR_PATHS + ("repaired", "failed")}
+
+
+def reset_repair_stats() -> None:
+    with _COUNTS_LOCK:
+        _COUNTS.clear()
+
+
+def _fold(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s.strip().lower())
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return re.sub(r"[\s\-]+", "_", s)
+
+
+def _first_object(t: str) -> Optional[str]:
+    """First balanced {...} block (string-aware), or None."""
+    start = t.find("{")
+    if start == -1:
+        return None
+    depth, in_str, esc = 0, False, False
+    for i in range(start, len(t)):
+        ch = t[i]
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if not depth:
+                return t[start:i + 1]
+    return None
+
+
+def _load_object(text: str, fixes: List[str]) -> Optional[Dict[str, Any]]:
+    t = text.strip()
+
+    if t.translate(_FR_QUOTES) != t:
+        t = _FR_QUOTE_PAD.sub('"', t.translate(_FR_QUOTES))
+        fixes.append("french_quotes")
+
+    block = _first_object(t)
+    if block is not None and block != t:
+        fixes.append("trailing_text")
+        t = block
+    elif block is None:
+        # No balanced object: wrap bare pairs / close an open brace.
+        body = t[t.find("{") + 1:] if "{" in t else t
+        cut = body.rfind("}")
+        body = body[:cut] if cut != -1 else body
+        if '"intent"' not in body and "'intent'" not in body:
+            return None
+        start = min(i for i in (body.find('"intent"'), body.find("'intent'"),
+                                body.find('"urgency"'), body.find('"action"'),
+                                body.find('"confidence"')) if i != -1)
+        t = "{" + body[start:].rstrip().rstrip(",") + "}"
+        fixes.append("missing_braces")
+
+    if _SINGLE_QUOTED.search(t):
+        t = _SINGLE_QUOTED.sub(lambda m: json.dumps(m.group(1)), t)
+        fixes.append("single_quotes")
+
+    if _TRAILING_COMMA.search(t):
+        t = _TRAILING_COMMA.sub(r"\1", t)
+        fixes.append("trailing_comma")
+
+    try:
+        obj = json.loads(t)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _fix_fields(obj: Dict[str, Any], fixes: List[str]) -> Optional[Dict[str, Any]]:
+    keys = {_fold(str(k)): k for k in obj}
+    if any(k not in keys for k in REQUIRED_KEYS):
+        return None
+    if len(obj) != len(REQUIRED_KEYS):
+        fixes.append("extra_keys")
+    out = {k: obj[keys[k]] for k in REQUIRED_KEYS}
+
+    # urgency / action: enums
+    for key, allowed in (("urgency", ALLOWED_URGENCY), ("action", ALLOWED_ACTION)):
+        v = out[key]
+        if not isinstance(v, str):
+            return None
+        if v in allowed:
+            continue
+        folded = _fold(v)
+        if folded in allowed:
+            out[key] = folded
+            fixes.append("enum_case")
+        elif key == "urgency" and folded in URGENCY_ALIASES:
+            out[key] = URGENCY_ALIASES[folded]
+            fixes.append("urgency_alias")
+        else:
+            return None
+
+    # intent: closest catalog entry
+    intent = out["intent"]
+    if not isinstance(intent, str) or not intent.strip():
+        return None
+    if intent not in CANONICAL_INTENTS:
+        folded = _fold(intent)
+        match = folded if folded in INTENTS else None
+        if match is None:
+            close = difflib.get_close_matches(folded, INTENTS, n=1, cutoff=INTENT_CUTOFF)
+            match = close[0] if close else None
+        if match is None:
+            return None
+        out["intent"] = match
+        fixes.append("intent_fuzzy")
+
+    # confidence: number in [0, 1]
+    conf = out["confidence"]
+    if isinstance(conf, bool):
+        return None
+    if isinstance(conf, str):
+        m = _PCT.match(conf)
+        if not m:
+            return None
+        conf = float(m.group(1).replace(",", ".")) / (100.0 if m.group(2) else 1.0)
+        fixes.append("confidence_coerced")
+    if isinstance(conf, (int, float)) and 1.0 < conf <= 100.0:
+        conf = conf / 100.0
+        if "confidence_coerced" not in fixes:
+            fixes.append("confidence_coerced")
+    out["confidence"] = conf
+    return out
+
+
+def is_canonical(obj: Any) -> bool:
+    """
+    True when a parsed decision can be used without repair. validate_decision_schema
+    accepts any non-empty intent, so this also requires a catalog intent and a real
+    (non-bool) confidence; anything else goes through the field fixes.
+    """
+    try:
+        validate_decision_schema(obj)
+    except ValueError:
+        return False
+    return obj["intent"] in CANONICAL_INTENTS and not isinstance(obj["confidence"], bool)
+
+
+def repair_decision(text: str, count: bool = True) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Try to turn raw LLM output into a schema-valid decision without another LLM call.
+    Returns (decision or None, repair paths applied). `count=False` skips the counters
+    (used for speculative checks on partial streams).
+    """
+    fixes: List[str] = []
+    obj = _load_object(text or "", fixes)
+    out = _fix_fields(obj, fixes) if obj is not None else None
+    fixes = list(dict.fromkeys(fixes))
+    if out is not None:
+        try:
+            validate_decision_schema(out)
+        except ValueError:
+            out = None
+
+    if count:
+        with _COUNTS_LOCK:
+            if out is None:
+                _COUNTS["failed"] += 1
+            else:
+                _COUNTS["repaired"] += 1
+                _COUNTS.update(fixes)
+    return out, fixes
@@ -1,25 +1,250 @@
 # Cheap rules that improve latency and stability.
 # These rules act as a fallback + signal for the LLM (or can be used alone).
+#
+# All keyword/urgency regexes from static.py are compiled once at import and
+# indexed by their possible first character, so one utterance costs one scan of
+# the text instead of one re.search per pattern.
 
-from typing import Tuple, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Tuple, List, Dict, Any, Iterable, Optional, Sequence, Set, FrozenSet
 import re
 from .static import INTENT_KEYWORDS, URG_HIGH, URG_MED
 
+# The first-char index reads patterns with re's private parser. If it is missing or its
+# layout changed, every pattern falls back to its own search (same hits, slower).
+try:
+    try:  # Python >= 3.11
+        from re import _parser as _sre_parse, _constants as _sre
+    except ImportError:  # Python 3.10
+        import sre_parse as _sre_parse
+        import sre_constants as _sre
+    _ZERO_WIDTH = (_sre.AT, _sre.ASSERT, _sre.ASSERT_NOT)
+    _REPEATS = tuple(getattr(_sre, n) for n in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+                     if hasattr(_sre, n))
+except (ImportError, AttributeError):
+    _sre_parse = _sre = None
+    _ZERO_WIDTH = _REPEATS = ()
+
+# Group names used for the urgency lists inside the matcher.
+URG_GROUPS = ("high", "med")
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _first_of_class(items) -> Optional[Set[str]]:
+    chars = set()
+    for op, av in items:
+        if op == _sre.LITERAL:
+            chars.add(chr(av))
+        elif op == _sre.RANGE and av[1] - av[0] <= 256:
+            chars.update(chr(c) for c in range(av[0], av[1] + 1))
+        else:  # NEGATE, CATEGORY (\w, \s...), huge ranges
+            return None
+    return chars
+
+
+def _first_of_seq(items) -> Tuple[Optional[Set[str]], bool]:
+    """(chars a parsed sequence can start with, can it match empty). None = unbounded."""
+    out = set()
+    for op, av in items:
+        if op in _ZERO_WIDTH:
+            continue
+        if op == _sre.LITERAL:
+            out.add(chr(av))
+            return out, False
+        if op == _sre.IN:
+            chars = _first_of_class(av)
+            if chars is None:
+                return None, False
+            return out | chars, False
+
+        if op == _sre.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            if add_flags or del_flags:
+                return None, False
+            chars, nullable = _first_of_seq(sub)
+        elif op == _sre.BRANCH:
+            chars, nullable = set(), False
+            for branch in av[1]:
+                c, n = _first_of_seq(branch)
+                if c is None:
+                    return None, False
+                chars |= c
+                nullable = nullable or n
+        elif op in _REPEATS:
+            lo, _, sub = av
+            chars, nullable = _first_of_seq(sub)
+            nullable = nullable or lo == 0
+        else:
+            return None, False
+
+        if chars is None:
+            return None, False
+        out |= chars
+        if not nullable:
+            return out, False
+    return out, True
+
+
+def _first_chars(pattern: "re.Pattern") -> Tuple[Optional[FrozenSet[str]], bool]:
+    """Return (possible first chars or None, pattern starts at a word start)."""
+    if _sre_parse is None or pattern.flags & re.IGNORECASE or not isinstance(pattern.pattern, str):
+        return None, False
+    try:  # anything the analysis does not understand goes to the legacy search
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+        chars, nullable = _first_of_seq(parsed)
+        if not chars or nullable:
+            return None, False
+
+        lead_boundary = False
+        for op, av in parsed:
+            if op not in _ZERO_WIDTH:
+                break
+            if op == _sre.AT and av == _sre.AT_BOUNDARY:
+                lead_boundary = True
+    except Exception:
+        return None, False
+    word_start = lead_boundary and all(_WORD_CHAR.match(c) for c in chars)
+    return frozenset(chars), word_start
+
+
+def _char_class(chars: Iterable[str]) -> str:
+    return "".join(re.escape(c) for c in sorted(chars))
+
+
+@dataclass
+class KeywordScan:
+    """Every keyword hit found in one utterance (offsets are in the lowered text)."""
+    # intent -> pattern -> start offsets
+    intent_positions: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+    # "high"/"med" -> pattern -> start offsets
+    urgency_positions: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+
+    def intent_hits(self, intent: str) -> int:
+        """Number of distinct patterns of `intent` that matched (the legacy hit count)."""
+        return len(self.intent_positions.get(intent, {}))
+
+    def intent_occurrences(self, intent: str) -> int:
+        """Total number of matches of `intent` patterns, repeats included."""
+        return sum(len(p) for p in self.intent_positions.get(intent, {}).values())
+
+    def urgency_hits(self, level: str) -> int:
+        return len(self.urgency_positions.get(level, {}))
+
+
+class KeywordMatcher:
+    """
+    Precompiled single-pass matcher over the intent and urgency regex catalogs.
+
+    Each pattern is compiled once and indexed by the characters it can start with
+    (derived from the parsed regex). One scanner regex walks the text and stops
+    only at offsets where some pattern can start; there, only the patterns of that
+    bucket are tried with `match()`. This reports the same hits as one `re.search`
+    per pattern, at a cost that grows with the bucket size instead of the catalog.
+    Patterns whose first character cannot be derived (all of them if re's private
+    parser is unavailable) are searched on their own.
+    """
+
+    def __init__(self,
+                 intent_keywords: Dict[str, Sequence[str]],
+                 urg_high: Sequence[str],
+                 urg_med: Sequence[str]):
+        self.intent_order = tuple(intent_keywords.keys())
+        # entries[i] = (kind, group, pattern source, compiled pattern)
+        self.entries: List[Tuple[str, str, str, Any]] = []
+        for intent, kws in intent_keywords.items():
+            for kw in kws:
+                self.entries.append(("intent", intent, kw, re.compile(kw)))
+        for level, pats in zip(URG_GROUPS, (urg_high, urg_med)):
+            for p in pats:
+                self.entries.append(("urgency", level, p, re.compile(p)))
+
+        # first char -> entry ids (kept in catalog order)
+        self._at_word_start: Dict[str, List[int]] = {}
+        self._anywhere: Dict[str, List[int]] = {}
+        self._generic: List[int] = []
+        for i, e in enumerate(self.entries):
+            first, word_start = _first_chars(e[3])
+            if first is None:
+                self._generic.append(i)
+                continue
+            table = self._at_word_start if word_start else self._anywhere
+            for c in first:
+                table.setdefault(c, []).append(i)
+
+        alts = []
+        if self._at_word_start:
+            alts.append(r"\b(?=[%s])" % _char_class(self._at_word_start))
+        if self._anywhere:
+            alts.append(r"(?=[%s])" % _char_class(self._anywhere))
+        self._scanner = re.compile("|".join(alts)) if alts else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def scan(self, text: str) -> KeywordScan:
+        """Scan the lowered text once and return every hit with its start offset."""
+        t = text.lower()
+        out = KeywordScan()
+        entries = self.entries
+
+        if self._scanner is not None:
+            ws, anyw = self._at_word_start, self._anywhere
+            for m in self._scanner.finditer(t):
+                pos = m.start()
+                c = t[pos]
+                for i in ws.get(c, ()):
+                    if entries[i][3].match(t, pos):
+                        self._record(out, i, pos)
+                for i in anyw.get(c, ()):
+                    if entries[i][3].match(t, pos):
+                        self._record(out, i, pos)
+
+        for i in self._generic:
+            for m in entries[i][3].finditer(t):
+                self._record(out, i, m.start())
+        return out
+
+    def scan_many(self, texts: Iterable[str]) -> List[KeywordScan]:
+        return [self.scan(t) for t in texts]
+
+    def _record(self, out: KeywordScan, i: int, pos: int) -> None:
+        kind, group, pattern, _ = self.entries[i]
+        bucket = out.intent_positions if kind == "intent" else out.urgency_positions
+        bucket.setdefault(group, {}).setdefault(pattern, []).append(pos)
+
+    def urgency(self, scan: KeywordScan) -> str:
+        if scan.urgency_hits("high"):
+            return "high"
+        if scan.urgency_hits("med"):
+            return "med"
+        return "low"
+
+    def intent_prior(self, scan: KeywordScan) -> Tuple[str, float]:
+        best_intent, best_hits = "unknown", 0
+        for intent in self.intent_order:
+            hits = scan.intent_hits(intent)
+            if hits > best_hits:
+                best_intent, best_hits = intent, hits
+        strength = min(1.0, best_hits / 3.0) if best_hits > 0 else 0.0
+        return best_intent, strength
+
+
+KEYWORD_MATCHER = KeywordMatcher(INTENT_KEYWORDS, URG_HIGH, URG_MED)
+
+
+def scan_keywords(text: str) -> KeywordScan:
+    return KEYWORD_MATCHER.scan(text)
+
 def score_urgency(text: str) -> str:
-    t = text.lower()
-    if any(re.search(p, t) for p in URG_HIGH):
-        return "high"
-    if any(re.search(p, t) for p in URG_MED):
-        return "med"
-    return "low"
+    return KEYWORD_MATCHER.urgency(KEYWORD_MATCHER.scan(text))
 
 def keyword_intent_prior(text: str) -> Tuple[str, float]:
     """Return (intent, strength 0..1) based on keyword hits."""
-    t = text.lower()
-    best_intent, best_hits = "unknown", 0
-    for intent, kws in INTENT_KEYWORDS.items():
-        hits = sum(1 for kw in kws if re.search(kw, t))
-        if hits > best_hits:
-            best_intent, best_hits = intent, hits
-    strength = min(1.0, best_hits / 3.0) if best_hits > 0 else 0.0
-    return best_intent, strength
+    return KEYWORD_MATCHER.intent_prior(KEYWORD_MATCHER.scan(text))
+
+def rules_signals(text: str) -> Tuple[str, str, float]:
+    """Return (urgency, intent, strength) from a single scan of the text."""
+    scan = KEYWORD_MATCHER.scan(text)
+    intent, strength = KEYWORD_MATCHER.intent_prior(scan)
+    return KEYWORD_MATCHER.urgency(scan), intent, strength
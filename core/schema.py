@@ -2,10 +2,23 @@
 # Stdlib only to keep it light + portable.
 
 from typing import Dict, Any
-from .static import ALLOWED_URGENCY, ALLOWED_ACTION
+from .static import ALLOWED_URGENCY, ALLOWED_ACTION, INTENTS
 
 REQUIRED_KEYS = ("intent", "urgency", "action", "confidence")
 
+# JSON Schema passed to Ollama's `format` for constrained decoding.
+DECISION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "enum": list(INTENTS)},
+        "urgency": {"type": "string", "enum": list(ALLOWED_URGENCY)},
+        "action": {"type": "string", "enum": list(ALLOWED_ACTION)},
+        "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+    },
+    "required": list(REQUIRED_KEYS),
+    "additionalProperties": False,
+}
+
 def validate_decision_schema(obj: Dict[str, Any]) -> None:
     if not isinstance(obj, dict):
         raise ValueError("Decision must be a dict.")
@@ -80,3 +80,20 @@ URG_MED = [
 # Default model names (override with env vars in prod)
 DEFAULT_EMBED_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"  # 768-dim
 DEFAULT_OLLAMA_MODEL = "llama3.2:1b-instruct"
+DEFAULT_OLLAMA_KEEP_ALIVE = "30m"   # how long Ollama keeps the model loaded after a call
+DEFAULT_OLLAMA_POOL_SIZE = 8        # pooled HTTP connections per client
+DEFAULT_OLLAMA_STREAM = True        # stream tokens and stop at the first complete decision
+DEFAULT_OLLAMA_FORMAT = "json"      # Ollama `format`: "json", "schema" (JSON schema) or None
+
+# Max concurrent Ollama requests for batch scoring (match OLLAMA_NUM_PARALLEL)
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Decision cache (core/cache.py): bounded LRU entries + time-to-live in seconds
+DEFAULT_DECISION_CACHE_SIZE = 2048
+DEFAULT_DECISION_CACHE_TTL_S = 15 * 60
+
+# Speculative decide mode: max wait for the LLM before using the rules decision
+DEFAULT_LLM_DEADLINE_S = 1.5
+
+# Metrics (core/metrics.py): recent samples kept per (node, mode) for percentiles
+DEFAULT_METRICS_WINDOW = 4096
@@ -0,0 +1,74 @@
+"""
+Tests for the local decision repair layer (core/repair.py)
+"""
+import pytest
+from core.llm_ollama import OllamaDecisionLLM
+from core.repair import is_canonical, repair_decision, repair_stats, reset_repair_stats
+
+VALID = '{"intent": "suivi_dossier", "urgency": "low", "action": "rag_query", "confidence": 0.8}'
+EXPECTED = {"intent": "suivi_dossier", "urgency": "low", "action": "rag_query", "confidence": 0.8}
+
+
+@pytest.fixture(autouse=True)
+def _clean_counters():
+    reset_repair_stats()
+    yield
+    reset_repair_stats()
+
+
+def _local(text):
+    llm = OllamaDecisionLLM(model="test")
+    llm._begin_stats()
+    return llm._local_decision(text), llm.last_repair["local"]
+
+
+@pytest.mark.parametrize("text, path", [
+    (VALID + "\nVoilà ma décision.", "trailing_text"),
+    ("{'intent': 'suivi_dossier', 'urgency': 'low', 'action': 'rag_query', 'confidence': 0.8}",
+     "single_quotes"),
+    ('{«intent»: «suivi_dossier», «urgency»: «low», «action»: «rag_query», «confidence»: 0.8}',
+     "french_quotes"),
+    (VALID[:-1], "missing_braces"),
+    (VALID.replace('"low"', '"medium"'), "urgency_alias"),
+    (VALID.replace("suivi_dossier", "suivi_dossiers"), "intent_fuzzy"),
+    (VALID.replace("0.8", '"80%"'), "confidence_coerced"),
+])
+def test_repair_paths(text, path):
+    out, fixes = repair_decision(text)
+    expected = dict(EXPECTED, urgency="med") if path == "urgency_alias" else EXPECTED
+    assert out == expected
+    assert path in fixes
+    assert repair_stats()[path] == 1
+
+
+def test_unrepairable_output_is_counted_as_failed():
+    out, fixes = repair_decision("je ne sais pas")
+    assert out is None
+    assert repair_stats()["failed"] == 1
+
+
+def test_is_canonical():
+    assert is_canonical(dict(EXPECTED))
+    assert is_canonical(dict(EXPECTED, intent="unknown"))
+    assert not is_canonical(dict(EXPECTED, intent="declaration_sinistres"))
+    assert not is_canonical(dict(EXPECTED, confidence=True))
+    assert not is_canonical(None)
+
+
+@pytest.mark.parametrize("intent, expected", [
+    ("declaration_sinistres", "declaration_sinistre"),
+    ("Suivi Dossier", "suivi_dossier"),
+])
+def test_schema_valid_near_miss_intent_is_repaired(intent, expected):
+    # validate_decision_schema accepts any non-empty intent: the client must still fix it
+    out, fixes = _local(VALID.replace("suivi_dossier", intent))
+    assert out["intent"] == expected
+    assert "intent_fuzzy" in fixes
+    assert repair_stats()["intent_fuzzy"] == 1
+
+
+def test_canonical_decision_skips_repair():
+    out, fixes = _local(VALID)
+    assert out == EXPECTED
+    assert fixes == []
+    assert repair_stats()["repaired"] == 0
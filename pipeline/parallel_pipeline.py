@@ -1,28 +1,57 @@
 import threading
 
+from Callbot_julie_inputs.pipeline.stages import PipelineStageError, StageExecutors, set_torch_threads
+
+STAGES = ("text", "audio")
+
+
 class ParallelPipeline:
-    def __init__(self, whisper, bert, wav2vec):
+    """
+    Text (Whisper -> BERT) and wav2vec paths on long-lived executors (stages.StageExecutors).
+    Same options as Callbot_julie_inputs/pipeline/parallel_pipeline.py: torch_threads
+    (process-wide), per-stage timeouts_s (partial results; a timed-out stage gets a fresh
+    executor), raise_errors, concurrency, and results["pipeline_stats"].
+    """
+
+    def __init__(self, whisper, bert, wav2vec, torch_threads=None, timeouts_s=None,
+                 raise_errors=True, concurrency=4):
         self.whisper = whisper
         self.bert = bert
         self.wav2vec = wav2vec
+        self.torch_threads = set_torch_threads(torch_threads)
+        self.timeouts_s = dict(timeouts_s or {})
+        self.raise_errors = raise_errors
+        self._stages = StageExecutors(STAGES, concurrency)
 
     def process(self, audio):
         results = {}
+        lock = threading.Lock()
 
         def text_path():
             text = self.whisper.transcribe(audio)
-            results["text"] = text
-            results["bert_sentiment"] = self.bert.analyze(text)
+            bert = self.bert.analyze(text)
+            with lock:
+                results["text"] = text
+                results["bert_sentiment"] = bert
 
         def audio_path():
-            results["wav2vec"] = self.wav2vec.analyze(audio)
+            wav2vec = self.wav2vec.analyze(audio)
+            with lock:
+                results["wav2vec"] = wav2vec
+
+        stats, errors = self._stages.run({"text": text_path, "audio": audio_path}, self.timeouts_s)
+        with lock:
+            out = dict(results)
+        out["pipeline_stats"] = stats
+        if errors and self.raise_errors:
+            raise PipelineStageError(errors, out)
+        return out
 
-        t1 = threading.Thread(target=text_path)
-        t2 = threading.Thread(target=audio_path)
+    def close(self):
+        self._stages.close()
 
-        t1.start()
-        t2.start()
-        t1.join()
-        t2.join()
+    def __enter__(self):
+        return self
 
-        return results
\ No newline at end of file
+    def __exit__(self, *exc):
+        self.close()